@@ -1,11 +1,27 @@
+import os
+import importlib
 import streamlit as st
-from components.dashboard import show_dashboard
-from components.data_view import show_data_view
-from components.about import show_about
-from components.comparison import show_comparison
 from utils.styles import apply_styles
+from utils.assets import get_asset
 from streamlit_option_menu import option_menu
 
+# Páginas carregadas sob demanda: (módulo, função de exibição)
+PAGES = {
+    "Painel Principal": ("components.dashboard", "show_dashboard"),
+    "Análise Comparativa": ("components.comparison", "show_comparison"),
+    "Visualização de Dados": ("components.data_view", "show_data_view"),
+    "Informações": ("components.about", "show_about"),
+}
+
+def is_admin_enabled():
+    """Verifica se o painel administrativo deve ser exibido (PAINEL_ADMIN=1 ou ?admin=1)."""
+    if os.environ.get('PAINEL_ADMIN', '0') == '1':
+        return True
+    try:
+        return st.query_params.get('admin') == '1'
+    except AttributeError:
+        return st.experimental_get_query_params().get('admin', ['0'])[0] == '1'
+
 # ----- CONFIGURAÇÃO DA PÁGINA -----
 st.set_page_config(
     page_title="Análise de Eficiência de Máquinas",
@@ -34,11 +50,17 @@ if 'first_load' not in st.session_state:
 if 'language' not in st.session_state:
     st.session_state.language = 'pt'
 
+# Dados da pasta monitorada (PAINEL_INGEST_DIR), quando configurada
+if os.environ.get('PAINEL_INGEST_DIR'):
+    from components.ingestion import sync_ingested_data
+    sync_ingested_data()
+
 # Logo da Britvic
 with st.container():
     st.markdown('<div class="logo-container">', unsafe_allow_html=True)
-    logo_url = "https://raw.githubusercontent.com/martins6231/app_atd/main/britvic_logo.png"
-    st.image(logo_url, width=200, output_format="PNG", use_container_width=False)
+    logo = get_asset('britvic_logo')
+    if logo:
+        st.image(logo, width=200, output_format="PNG")
     st.markdown('</div>', unsafe_allow_html=True)
 
 # Título principal
@@ -47,7 +69,7 @@ st.markdown('<div class="main-title">Análise de Eficiência de Máquinas</div>'
 # Menu de navegação
 selected = option_menu(
     menu_title=None,
-    options=["Painel Principal", "Análise Comparativa", "Visualização de Dados", "Informações"],
+    options=list(PAGES.keys()),
     icons=["speedometer2", "graph-up-arrow", "table", "info-circle"],
     menu_icon="cast",
     default_index=0,
@@ -60,15 +82,14 @@ selected = option_menu(
     }
 )
 
-# Exibe a página selecionada
-if selected == "Painel Principal":
-    show_dashboard()
-elif selected == "Análise Comparativa":
-    show_comparison()
-elif selected == "Visualização de Dados":
-    show_data_view()
-elif selected == "Informações":
-    show_about()
+# Exibe a página selecionada, importando seu módulo apenas quando necessário
+module_name, function_name = PAGES[selected]
+getattr(importlib.import_module(module_name), function_name)()
+
+# Painel administrativo de desempenho (opcional, importado apenas quando habilitado)
+if is_admin_enabled():
+    from components.admin import show_admin_panel
+    show_admin_panel()
 
 # Rodapé
 st.markdown("""
@@ -0,0 +1,107 @@
+"""
+Chart build benchmark.
+
+Builds every figure of the dashboard and comparison pages from a synthetic
+dataset, bypassing the chart cache, and reports per builder the median time to
+construct the figure and to serialize it to JSON (what st.plotly_chart sends to
+the browser).
+
+Usage:
+    python benchmarks/figures.py [--rows 20000] [--repeat 20]
+"""
+import os
+import sys
+import time
+import inspect
+import argparse
+import statistics
+
+import numpy as np
+import pandas as pd
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from core.processing import process_data
+from core import calculations
+from utils import visualizations
+
+
+def synthetic_data(rows, seed=0):
+    """Return a processed stoppage dataset with one year of random events."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit='s')
+    duration = pd.to_timedelta(np.exp(rng.normal(3, 1.2, rows)).astype(int) * 6, unit='s')
+    return process_data(pd.DataFrame({
+        'Máquina': rng.choice([78, 79, 80, 89, 91], rows),
+        'Inicio': start,
+        'Fim': start + duration,
+        'Duração': duration,
+        'Parada': rng.choice(['Troca de formato', 'Falta de material', 'Manutenção elétrica', 'Limpeza',
+                              'Ajuste mecânico', 'Setup', 'Quebra de garrafa', 'Falha de sensor'], rows),
+        'Área Responsável': rng.choice(['Manutenção', 'PCP', 'Produção', 'Qualidade'], rows),
+    }))
+
+
+def chart_inputs(df):
+    """Return (builder name, positional arguments) for every chart of the app."""
+    index = calculations.build_duration_index(df)
+    return [
+        ('create_pareto_chart', (calculations.pareto_stoppage_causes(df),)),
+        ('create_area_pie_chart', (calculations.calculate_stoppage_by_area(df),)),
+        ('create_occurrences_chart', (calculations.calculate_stoppage_occurrence_rate(df),)),
+        ('create_monthly_duration_chart', (calculations.calculate_total_duration_by_month(df),)),
+        ('create_area_time_chart', (calculations.calculate_total_stoppage_time_by_area(df),)),
+        ('create_critical_stoppages_chart', (calculations.top_critical_stoppages(index),)),
+        ('create_critical_areas_pie_chart', (calculations.critical_area_counts(index),)),
+        ('create_duration_distribution_chart', (calculations.calculate_duration_histogram(df),)),
+        ('create_comparison_gauge_chart', (97.5, 98.2, 'Disponibilidade')),
+        ('create_comparative_bar_chart', (12.4, 10.9, 'MTTR')),
+        ('create_shifts_distribution_chart', (calculations.calculate_shifts_distribution(df),)),
+    ]
+
+
+def _median_ms(func, repeat):
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def measure(df, repeat):
+    """Return {builder: (build ms, serialize ms)}, measured without the chart cache."""
+    results = {}
+    for name, args in chart_inputs(df):
+        builder = inspect.unwrap(getattr(visualizations, name))
+        fig = builder(*args)
+        results[name] = (
+            _median_ms(lambda: builder(*args), repeat),
+            _median_ms(fig.to_json, repeat) if fig is not None else float('nan'),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='rows of the synthetic dataset')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per measurement (median is reported)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    import plotly.graph_objects  # noqa: F401 - import cost is reported separately
+    print(f'Plotly import:                      {(time.perf_counter() - start) * 1000:8.1f} ms')
+
+    results = measure(synthetic_data(args.rows), args.repeat)
+    print(f'{"Builder":<36}{"build ms":>10}{"to_json ms":>12}')
+    for name, (build_ms, json_ms) in results.items():
+        print(f'{name:<36}{build_ms:10.2f}{json_ms:12.2f}')
+    total_build = sum(build for build, _ in results.values())
+    total_json = sum(json for _, json in results.values() if not np.isnan(json))
+    print(f'{"Total":<36}{total_build:10.2f}{total_json:12.2f}')
+
+
+if __name__ == '__main__':
+    main()
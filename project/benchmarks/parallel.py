@@ -0,0 +1,82 @@
+"""
+Parallel KPI benchmark.
+
+Computes the KPI bundles by partition on synthetic datasets of growing size,
+once in the calling process and once through the process pool, and reports the
+median time of each and the speedup. The smallest size with a speedup above 1
+is the value to use for PAINEL_PARALLEL_MIN_ROWS on this host; when there is
+none (e.g. on a single CPU), leave it unset so the pool is never used.
+
+Usage:
+    python benchmarks/parallel.py [--rows 100000 300000 1000000] [--workers N] [--repeat 3]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from core import parallel
+from benchmarks.figures import synthetic_data
+
+PARTITIONS = {'Máquina': 'Máquina', 'Máquina x Ano-Mês': ['Máquina', 'Ano-Mês']}
+
+
+def _median_s(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def measure(df, by, workers, repeat):
+    """Return (serial s, pool s) for the partitions of df by the given key."""
+    keys = by if isinstance(by, list) else [by]
+    columns = df[list(dict.fromkeys(parallel.KPI_COLUMNS + keys))]
+    order, bounds = parallel._partition_bounds(df, by)
+    workers = min(workers, len(bounds))
+    # Warm-up: starts the pool once, as the app does on the first analysis
+    parallel._compute_pooled(columns, by, order, bounds, None, workers)
+    return (
+        _median_s(lambda: parallel._compute_serial(columns, by, order, bounds, None), repeat),
+        _median_s(lambda: parallel._compute_pooled(columns, by, order, bounds, None, workers), repeat),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 300000, 1000000, 2000000],
+                        help='sizes of the synthetic datasets')
+    parser.add_argument('--workers', type=int, default=max(2, parallel.CPU_COUNT), help='pool size')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement (median is reported)')
+    args = parser.parse_args()
+
+    print(f'CPUs: {parallel.CPU_COUNT}, workers: {args.workers}')
+    print(f'{"Rows":>10}  {"Partitions":<20}{"serial s":>10}{"pool s":>10}{"speedup":>9}')
+    threshold = None
+    try:
+        for rows in sorted(args.rows):
+            df = synthetic_data(rows)
+            speedups = []
+            for label, by in PARTITIONS.items():
+                serial, pooled = measure(df, by, args.workers, args.repeat)
+                speedups.append(serial / pooled)
+                print(f'{rows:>10}  {label:<20}{serial:10.2f}{pooled:10.2f}{serial / pooled:9.2f}')
+            if threshold is None and parallel.CPU_COUNT > 1 and min(speedups) > 1:
+                threshold = rows
+    finally:
+        parallel.shutdown()
+
+    if threshold is None:
+        print('The pool is not faster at any size: leave PAINEL_PARALLEL_MIN_ROWS unset.')
+    else:
+        print(f'Suggested PAINEL_PARALLEL_MIN_ROWS={threshold}')
+
+
+if __name__ == '__main__':
+    main()
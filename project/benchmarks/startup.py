@@ -0,0 +1,124 @@
+"""
+Startup-time benchmark.
+
+Measures, each in a fresh interpreter:
+  - import time of every page module (on top of streamlit, which is always loaded);
+  - first script run of app.py (time until the first page is fully rendered by
+    the Streamlit script runner, a proxy for first-paint latency);
+  - readiness of `streamlit run app.py` (time until the health endpoint answers).
+
+Usage:
+    python benchmarks/startup.py [--repeat 5] [--skip-server]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE_MODULES = [
+    'components.dashboard',
+    'components.comparison',
+    'components.data_view',
+    'components.about',
+]
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {project!r})
+import streamlit
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+FIRST_RUN_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=120)
+app.run()
+assert not app.exception, app.exception
+print(time.perf_counter() - start)
+"""
+
+
+def _run_python(snippet):
+    result = subprocess.run(
+        [sys.executable, '-c', snippet],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_imports(repeat):
+    """Return the median import time (s) of each page module."""
+    return {
+        module: statistics.median(
+            _run_python(IMPORT_SNIPPET.format(project=PROJECT_DIR, module=module)) for _ in range(repeat)
+        )
+        for module in PAGE_MODULES
+    }
+
+
+def measure_first_run(repeat):
+    """Return the median duration (s) of the first cold run of app.py."""
+    app_path = os.path.join(PROJECT_DIR, 'app.py')
+    return statistics.median(_run_python(FIRST_RUN_SNIPPET.format(app=app_path)) for _ in range(repeat))
+
+
+def measure_server(repeat, timeout=60):
+    """Return the median time (s) until `streamlit run app.py` answers its health check."""
+    timings = []
+    for _ in range(repeat):
+        port = _free_port()
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', 'app.py', '--server.headless', 'true',
+             '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+            cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            while time.perf_counter() - start < timeout:
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                        if response.status == 200:
+                            timings.append(time.perf_counter() - start)
+                            break
+                except OSError:
+                    time.sleep(0.05)
+        finally:
+            process.terminate()
+            process.wait()
+    return statistics.median(timings) if timings else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (median is reported)')
+    parser.add_argument('--skip-server', action='store_true', help='do not start a streamlit server')
+    args = parser.parse_args()
+
+    print('Import time per page module (after streamlit):')
+    for module, seconds in measure_imports(args.repeat).items():
+        print(f'  {module:<25} {seconds * 1000:8.1f} ms')
+
+    print(f'First run of app.py:        {measure_first_run(args.repeat) * 1000:8.1f} ms')
+
+    if not args.skip_server:
+        print(f'Server ready (health):      {measure_server(args.repeat) * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Relatório de KPIs em lote, sem interface Streamlit.
+
+Carrega uma ou mais planilhas de paradas através de process_data e calcula os
+indicadores do painel para cada combinação máquina × mês, gravando o resultado
+em Parquet, CSV ou Excel. Pensado para execução agendada (cron).
+
+Uso:
+    python cli.py paradas_2024.xlsx paradas_2025.xlsx -o kpis.parquet
+    python cli.py exportacoes/*.xlsx -o kpis.csv --include-all
+    python cli.py paradas_*.xlsx -o kpis.parquet --workers 8
+    python cli.py paradas_*.xlsx -o kpis.parquet --checks cheap
+    python cli.py paradas_*.xlsx -o kpis.parquet --keep-duplicates
+"""
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+from core.processing import process_data
+from core.parallel import compute_kpis_by_partition
+from core.validation import validate_data, parse_checks
+from core.dedup import deduplicate_stoppages
+
+OUTPUT_FORMATS = ('parquet', 'csv', 'xlsx')
+
+
+def load_workbooks(paths, checks=None, keep_duplicates=False):
+    """
+    Lê, valida e processa as planilhas informadas em um único DataFrame.
+
+    Paradas repetidas em exportações de períodos sobrepostos (mesma máquina,
+    início, fim e causa normalizados) são descartadas, salvo keep_duplicates.
+
+    Returns:
+        tuple: (DataFrame processado, relatório de validação, nº de paradas
+            repetidas descartadas; checks=None usa PAINEL_VALIDATION_CHECKS)
+    """
+    raw = pd.concat([pd.read_excel(path) for path in paths], ignore_index=True)
+    report = validate_data(raw, checks).report
+    df = process_data(raw)
+    if keep_duplicates:
+        return df, report, 0
+    deduplicated, duplicates = deduplicate_stoppages(df)
+    return deduplicated.reset_index(drop=True), report, duplicates
+
+
+def print_validation(report):
+    """Resume no stderr as verificações de qualidade que encontraram problemas."""
+    for row in report[report['rows'] > 0].itertuples(index=False):
+        print(f"aviso: {row.rows} linhas - {row.description} (ex.: linhas {row.examples})", file=sys.stderr)
+
+
+def build_report(df, include_all=False, workers=None):
+    """
+    Gera a tabela de KPIs por máquina × mês.
+
+    Args:
+        df: DataFrame processado por process_data
+        include_all: Inclui também as linhas "Todas" (todas as máquinas por mês)
+        workers: Processos usados no cálculo (padrão: PAINEL_WORKERS; 1 = sem paralelismo)
+
+    Returns:
+        pd.DataFrame: Uma linha por combinação máquina × mês
+    """
+    report = compute_kpis_by_partition(df, by=['Máquina', 'Ano-Mês'], workers=workers).reset_index()
+    if include_all:
+        pooled = compute_kpis_by_partition(df, by='Ano-Mês', workers=workers).reset_index()
+        pooled.insert(0, 'Máquina', 'Todas')
+        report = pd.concat([report, pooled], ignore_index=True)
+    return report
+
+
+def write_report(report, output, output_format=None):
+    """Grava o relatório no formato indicado (ou deduzido da extensão)."""
+    output_format = output_format or os.path.splitext(output)[1].lstrip('.').lower()
+    if output_format == 'parquet':
+        report.to_parquet(output, index=False)
+    elif output_format == 'csv':
+        report.to_csv(output, index=False)
+    elif output_format == 'xlsx':
+        report.to_excel(output, index=False, engine='xlsxwriter')
+    else:
+        raise ValueError(f"Formato de saída não suportado: {output_format!r} (use {', '.join(OUTPUT_FORMATS)})")
+
+
+def _checks(value):
+    try:
+        return parse_checks(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('workbooks', nargs='+', help='planilhas Excel com os dados de paradas')
+    parser.add_argument('-o', '--output', required=True, help='arquivo de saída (.parquet, .csv ou .xlsx)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, help='formato de saída (padrão: extensão do arquivo)')
+    parser.add_argument('--include-all', action='store_true', help='inclui linhas "Todas" com todas as máquinas')
+    parser.add_argument('--workers', type=int, help='processos para o cálculo dos KPIs (padrão: PAINEL_WORKERS ou nº de CPUs)')
+    parser.add_argument('--checks', type=_checks, default=None,
+                        help='verificações de qualidade: all, cheap, none ou lista separada por vírgulas '
+                             '(padrão: PAINEL_VALIDATION_CHECKS ou all)')
+    parser.add_argument('--keep-duplicates', action='store_true',
+                        help='mantém paradas repetidas entre planilhas (padrão: descarta)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df, validation, duplicates = load_workbooks(args.workbooks, args.checks, args.keep_duplicates)
+    print_validation(validation)
+    if duplicates:
+        print(f"aviso: {duplicates} paradas repetidas descartadas", file=sys.stderr)
+    report = build_report(df, include_all=args.include_all, workers=args.workers)
+    write_report(report, args.output, args.format)
+
+    print(f"{len(report)} linhas ({len(df)} paradas) gravadas em {args.output} "
+          f"em {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,9 @@
 import streamlit as st
 import pandas as pd
+from utils.assets import get_asset
+from utils.profiling import profiled
 
+@profiled(kind='page')
 def show_about():
     """Exibe a página de informações."""
     
@@ -11,7 +14,11 @@ def show_about():
         col1, col2 = st.columns([1, 2])
         
         with col1:
-            st.image("https://img.icons8.com/fluency/240/factory.png", width=150)
+            icon = get_asset('factory_icon')
+            if icon:
+                st.image(icon, width=150)
+            else:
+                st.markdown("# 🏭")
         
         with col2:
             st.markdown("""
@@ -136,8 +143,6 @@ def show_about():
         streamlit>=1.22.0
         pandas>=2.0.1
         numpy>=1.26.0
-        matplotlib>=3.7.1
-        seaborn>=0.12.2
         plotly>=5.14.1
         openpyxl>=3.1.2
         xlsxwriter>=3.1.0
@@ -0,0 +1,95 @@
+import streamlit as st
+import pandas as pd
+from utils import profiling
+from core.cache import get_backend
+from core.ingestion import get_service
+
+
+def show_admin_panel():
+    """Exibe o painel de desempenho na barra lateral."""
+    show_cache_panel()
+    show_profiling_panel()
+    show_ingestion_panel()
+
+
+def show_cache_panel():
+    """Exibe o uso de memória e as estatísticas do cache compartilhado."""
+    with st.sidebar.expander("🗄️ Cache", expanded=False):
+        backend = get_backend()
+        st.caption(f"Backend: {type(backend).__name__}")
+        budget_mb = backend.max_bytes / (1024 * 1024)
+        st.progress(min(1.0, backend.used_mb / budget_mb) if budget_mb else 0.0,
+                    text=f"{backend.used_mb:.1f} MB de {budget_mb:.0f} MB")
+
+        new_budget = st.number_input("Orçamento de memória (MB)", min_value=16, value=int(budget_mb), step=64,
+                                     key="admin_cache_budget")
+        if new_budget != int(budget_mb):
+            backend.set_budget(new_budget)
+
+        stats = backend.stats()
+        if stats.empty:
+            st.info("Cache vazio.")
+        else:
+            st.dataframe(stats.round(2), use_container_width=True)
+
+        if st.button("Limpar cache", key="admin_clear_cache", use_container_width=True):
+            backend.clear()
+            st.rerun()
+
+
+def show_profiling_panel():
+    """Exibe as medições de tempo, cache e memória."""
+    with st.sidebar.expander("⏱️ Desempenho", expanded=False):
+        enabled = st.checkbox("Ativar medições", value=profiling.is_enabled(), key="admin_profiling")
+        if enabled != profiling.is_enabled():
+            profiling.set_enabled(enabled)
+
+        records = profiling.get_records()
+        if not records:
+            st.info("Nenhuma medição registrada.")
+            return
+
+        df_records = pd.DataFrame(records)
+
+        # Resumo por função/página
+        summary = df_records.groupby(['kind', 'name']).agg(
+            chamadas=('wall_ms', 'size'),
+            hits=('cache', lambda x: (x == 'hit').sum()),
+            misses=('cache', lambda x: (x == 'miss').sum()),
+            total_ms=('wall_ms', 'sum'),
+            medio_ms=('wall_ms', 'mean'),
+            max_ms=('wall_ms', 'max'),
+            memoria_kb=('memory_delta_kb', 'sum')
+        ).sort_values('total_ms', ascending=False)
+
+        st.markdown("**Resumo**")
+        st.dataframe(summary.round(2), use_container_width=True)
+
+        st.markdown("**Últimas chamadas**")
+        st.dataframe(df_records.tail(50).iloc[::-1], use_container_width=True, hide_index=True)
+
+        st.caption(f"Log estruturado: `{profiling.LOG_PATH}`")
+        if st.button("Limpar medições", key="admin_clear_profiling", use_container_width=True):
+            profiling.clear_records()
+            st.rerun()
+
+
+def show_ingestion_panel():
+    """Exibe o histórico da ingestão automática da pasta monitorada."""
+    service = get_service()
+    if service is None:
+        return
+
+    with st.sidebar.expander("📂 Ingestão", expanded=False):
+        st.caption(f"Pasta: `{service.directory}` (a cada {service.interval:.0f}s)")
+        st.metric("Versão dos dados", service.version)
+
+        changes = service.changes()
+        if changes:
+            st.dataframe(pd.DataFrame(changes), use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma planilha ingerida.")
+
+        if st.button("Verificar agora", key="admin_ingestion_scan", use_container_width=True):
+            service.scan()
+            st.rerun()
@@ -1,13 +1,16 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import io
-import base64
-from utils.data_processing import process_data, filter_data, get_download_link, filter_data_by_date_range
-from utils.calculations import compare_periods
+from utils.data_processing import filter_data, get_download_link
+from utils.calculations import compare_periods, build_duration_sketches
+from core.aggregates import filter_partitions
+from core.sketches import sketch_quantiles, RELATIVE_ACCURACY
 from utils.visualizations import create_comparison_gauge_chart, create_comparative_bar_chart
-from utils.i18n import get_translation
+from utils.chart_specs import fingerprint, get_chart_spec, render_chart_spec
+from utils.i18n import get_translation, get_formatter
+from utils.profiling import profiled
 
+@profiled(kind='page')
 def show_comparison():
     """Display the period comparison page."""
     t = get_translation()
@@ -124,6 +127,11 @@ def show_comparison():
                         # Compare periods
                         comparison_results = compare_periods(data1, data2)
                         
+                        # Duration sketches of each period, merged from the per-partition sketches
+                        sketches = build_duration_sketches(st.session_state.df)
+                        sketches1 = filter_partitions(sketches, machine_for_filter, start_date=start_datetime1, end_date=end_datetime1)
+                        sketches2 = filter_partitions(sketches, machine_for_filter, start_date=start_datetime2, end_date=end_datetime2)
+                        
                         # Store results in session state
                         st.session_state.comparison_data = {
                             'period1': (start_date1, end_date1),
@@ -131,7 +139,9 @@ def show_comparison():
                             'machine': selected_machine,
                             'data1': data1,
                             'data2': data2,
-                            'results': comparison_results
+                            'results': comparison_results,
+                            'sketches1': sketches1,
+                            'sketches2': sketches2
                         }
                 else:
                     if start_date1 > end_date1:
@@ -145,9 +155,51 @@ def show_comparison():
     if 'comparison_data' in st.session_state and st.session_state.comparison_data:
         display_comparison_results()
 
+def show_comparison_chart(comparison_data, name, build):
+    """Display a comparison chart, serialized once per comparison result and language."""
+    if 'fingerprint' not in comparison_data:
+        comparison_data['fingerprint'] = fingerprint(comparison_data['results']['metrics'])
+    chart_spec = get_chart_spec(comparison_data['fingerprint'], name, st.session_state.language, build)
+    if chart_spec:
+        render_chart_spec(chart_spec, f'comparison_{name}')
+
+def show_percentiles_comparison(comparison_data, t):
+    """Display p50/p90/p99 stoppage durations of both periods, from merged quantile sketches."""
+    sketches1, sketches2 = comparison_data.get('sketches1'), comparison_data.get('sketches2')
+    if sketches1 is None or (sketches1.empty and sketches2.empty):
+        return
+    
+    st.markdown(f'<div class="section-title">{t("duration_percentiles")}</div>', unsafe_allow_html=True)
+    
+    with st.container():
+        st.markdown('<div class="content-box">', unsafe_allow_html=True)
+        
+        groups = {
+            t('overall'): None,
+            t('by_machine'): 'Máquina',
+            t('by_area'): 'Área Responsável',
+            t('by_cause'): 'Parada',
+        }
+        group = st.radio(t('percentiles_by'), list(groups), horizontal=True, key="comparison_percentiles_by")
+        level = groups[group]
+        
+        percentiles = pd.concat(
+            {t('period_1'): sketch_quantiles(sketches1, by=level), t('period_2'): sketch_quantiles(sketches2, by=level)},
+            axis=1
+        )
+        if level is None:
+            percentiles.index = [t('overall')]
+        
+        st.dataframe(percentiles.round(1), use_container_width=True)
+        st.caption(t('approximate_percentiles').format(accuracy=RELATIVE_ACCURACY))
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+
+@profiled(kind='page')
 def display_comparison_results():
     """Display the period comparison results."""
     t = get_translation()
+    fmt = get_formatter()
     comparison_data = st.session_state.comparison_data
     
     # Title
@@ -162,14 +214,14 @@ def display_comparison_results():
         
         with col1:
             start_date1, end_date1 = comparison_data['period1']
-            st.markdown(f"**{t('period_1')}:** {start_date1.strftime('%d/%m/%Y')} - {end_date1.strftime('%d/%m/%Y')}")
+            st.markdown(f"**{t('period_1')}:** {fmt.date(start_date1)} - {fmt.date(end_date1)}")
             st.markdown(f"**{t('duration')}:** {(end_date1 - start_date1).days + 1} {t('days')}")
             st.markdown(f"**{t('machine')}:** {comparison_data['machine']}")
             st.markdown(f"**{t('total_stoppages')}:** {len(comparison_data['data1'])}")
         
         with col2:
             start_date2, end_date2 = comparison_data['period2']
-            st.markdown(f"**{t('period_2')}:** {start_date2.strftime('%d/%m/%Y')} - {end_date2.strftime('%d/%m/%Y')}")
+            st.markdown(f"**{t('period_2')}:** {fmt.date(start_date2)} - {fmt.date(end_date2)}")
             st.markdown(f"**{t('duration')}:** {(end_date2 - start_date2).days + 1} {t('days')}")
             st.markdown(f"**{t('total_stoppages')}:** {len(comparison_data['data2'])}")
         
@@ -187,26 +239,24 @@ def display_comparison_results():
         with col1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             availability1, availability2, diff_availability, pct_availability = metrics['availability']
-            fig_availability = create_comparison_gauge_chart(
-                availability1, 
-                availability2, 
+            show_comparison_chart(comparison_data, 'availability', lambda: create_comparison_gauge_chart(
+                availability1,
+                availability2,
                 t('availability'),
                 max_value=100,
                 language=st.session_state.language
-            )
-            st.plotly_chart(fig_availability, use_container_width=True)
+            ))
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             mtbf1, mtbf2, diff_mtbf, pct_mtbf = metrics['mtbf']
-            fig_mtbf = create_comparative_bar_chart(
-                mtbf1, 
-                mtbf2, 
+            show_comparison_chart(comparison_data, 'mtbf', lambda: create_comparative_bar_chart(
+                mtbf1,
+                mtbf2,
                 t('mtbf'),
                 language=st.session_state.language
-            )
-            st.plotly_chart(fig_mtbf, use_container_width=True)
+            ))
             st.markdown('</div>', unsafe_allow_html=True)
         
         # MTTR and total stoppages
@@ -215,25 +265,23 @@ def display_comparison_results():
         with col1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             mttr1, mttr2, diff_mttr, pct_mttr = metrics['mttr']
-            fig_mttr = create_comparative_bar_chart(
-                mttr1, 
-                mttr2, 
+            show_comparison_chart(comparison_data, 'mttr', lambda: create_comparative_bar_chart(
+                mttr1,
+                mttr2,
                 t('mttr'),
                 language=st.session_state.language
-            )
-            st.plotly_chart(fig_mttr, use_container_width=True)
+            ))
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             stoppages1, stoppages2, diff_stoppages, pct_stoppages = metrics['total_stoppages']
-            fig_stoppages = create_comparative_bar_chart(
-                stoppages1, 
-                stoppages2, 
+            show_comparison_chart(comparison_data, 'stoppages', lambda: create_comparative_bar_chart(
+                stoppages1,
+                stoppages2,
                 t('total_stoppages'),
                 language=st.session_state.language
-            )
-            st.plotly_chart(fig_stoppages, use_container_width=True)
+            ))
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Total downtime
@@ -242,13 +290,12 @@ def display_comparison_results():
         with col1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             downtime1, downtime2, diff_downtime, pct_downtime = metrics['total_downtime']
-            fig_downtime = create_comparative_bar_chart(
-                downtime1, 
-                downtime2, 
+            show_comparison_chart(comparison_data, 'downtime', lambda: create_comparative_bar_chart(
+                downtime1,
+                downtime2,
                 t('total_stoppage_time'),
                 language=st.session_state.language
-            )
-            st.plotly_chart(fig_downtime, use_container_width=True)
+            ))
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Summary table
@@ -267,32 +314,32 @@ def display_comparison_results():
                     t('total_stoppage_time')
                 ],
                 f"{t('period_1')}": [
-                    f"{availability1:.1f}%",
-                    f"{mtbf1:.1f}h",
-                    f"{mttr1:.1f}h",
-                    f"{int(stoppages1)}",
-                    f"{downtime1:.1f}h"
+                    fmt.percent(availability1),
+                    fmt.number(mtbf1, suffix='h'),
+                    fmt.number(mttr1, suffix='h'),
+                    fmt.number(stoppages1, 0),
+                    fmt.number(downtime1, suffix='h')
                 ],
                 f"{t('period_2')}": [
-                    f"{availability2:.1f}%",
-                    f"{mtbf2:.1f}h",
-                    f"{mttr2:.1f}h",
-                    f"{int(stoppages2)}",
-                    f"{downtime2:.1f}h"
+                    fmt.percent(availability2),
+                    fmt.number(mtbf2, suffix='h'),
+                    fmt.number(mttr2, suffix='h'),
+                    fmt.number(stoppages2, 0),
+                    fmt.number(downtime2, suffix='h')
                 ],
                 t('variation'): [
-                    f"{diff_availability:+.1f}%",
-                    f"{diff_mtbf:+.1f}h",
-                    f"{diff_mttr:+.1f}h",
-                    f"{int(diff_stoppages):+d}",
-                    f"{diff_downtime:+.1f}h"
+                    fmt.percent(diff_availability, signed=True),
+                    fmt.number(diff_mtbf, suffix='h', signed=True),
+                    fmt.number(diff_mttr, suffix='h', signed=True),
+                    fmt.number(diff_stoppages, 0, signed=True),
+                    fmt.number(diff_downtime, suffix='h', signed=True)
                 ],
                 f"{t('variation')} (%)" : [
-                    f"{pct_availability:+.1f}%" if pct_availability != float('inf') else "N/A",
-                    f"{pct_mtbf:+.1f}%" if pct_mtbf != float('inf') else "N/A",
-                    f"{pct_mttr:+.1f}%" if pct_mttr != float('inf') else "N/A",
-                    f"{pct_stoppages:+.1f}%" if pct_stoppages != float('inf') else "N/A",
-                    f"{pct_downtime:+.1f}%" if pct_downtime != float('inf') else "N/A"
+                    fmt.percent(pct_availability, signed=True) if pct_availability != float('inf') else "N/A",
+                    fmt.percent(pct_mtbf, signed=True) if pct_mtbf != float('inf') else "N/A",
+                    fmt.percent(pct_mttr, signed=True) if pct_mttr != float('inf') else "N/A",
+                    fmt.percent(pct_stoppages, signed=True) if pct_stoppages != float('inf') else "N/A",
+                    fmt.percent(pct_downtime, signed=True) if pct_downtime != float('inf') else "N/A"
                 ],
                 t('status'): [
                     "🟢" if diff_availability > 0 else ("🔴" if diff_availability < 0 else "⚪"),
@@ -321,6 +368,9 @@ def display_comparison_results():
             
             st.markdown('</div>', unsafe_allow_html=True)
         
+        # Duration percentiles
+        show_percentiles_comparison(comparison_data, t)
+        
         # Conclusions
         st.markdown(f'<div class="section-title">{t("comparison_conclusions")}</div>', unsafe_allow_html=True)
         
@@ -1,21 +1,75 @@
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import time
-from utils.data_processing import process_data, filter_data, get_month_name, get_download_link
+from utils.data_processing import (
+    process_data, filter_data, get_month_name, get_download_link, validate_data, deduplicate_stoppages
+)
 from utils.calculations import (
     calculate_availability, calculate_average_downtime,
     calculate_stoppage_by_area, pareto_stoppage_causes, most_frequent_stoppages,
     calculate_stoppage_occurrence_rate, calculate_total_duration_by_month,
-    calculate_total_stoppage_time_by_area, identify_critical_stoppages,
-    calculate_mtbf_mttr, calculate_scheduled_time, generate_recommendations
+    calculate_total_stoppage_time_by_area, build_duration_index,
+    calculate_mtbf_mttr, calculate_scheduled_time, generate_recommendations,
+    calculate_duration_histogram, compute_kpis_by_partition, build_duration_sketches,
+    calculate_stoppage_time_series, build_pareto_cube
 )
 from utils.visualizations import (
     create_pareto_chart, create_area_pie_chart, create_occurrences_chart,
     create_monthly_duration_chart, create_area_time_chart, create_critical_stoppages_chart,
-    create_critical_areas_pie_chart, create_duration_distribution_chart
+    create_critical_areas_pie_chart, create_duration_distribution_chart, create_trend_chart
+)
+from utils.visualizations import TREND_MAX_POINTS
+from utils.chart_specs import fingerprint, get_chart_spec, render_chart_spec
+from utils.profiling import profiled, profile_block
+from utils.i18n import get_translation
+from components.ingestion import show_ingestion_status
+from core.ingestion import get_service
+from core.aggregates import (
+    filter_partitions, kpis_from_partitions, scheduled_time_from_partitions, drill_down, DRILL_LEVELS
+)
+from core.sketches import sketch_quantiles, RELATIVE_ACCURACY
+from core.validation import flag_names
+from core.calculations import (
+    CRITICAL_HOUR_LIMIT, critical_start, top_critical_stoppages, critical_area_counts, identify_critical_stoppages
 )
 
+# Intervalo (s) de atualização do modo ao vivo
+LIVE_REFRESH_SECONDS = float(os.environ.get('PAINEL_LIVE_INTERVAL', '5'))
+
+def render_chart(chart_spec, name):
+    """Renderiza um gráfico já serializado (get_chart_spec), medindo o custo de envio ao navegador."""
+    if chart_spec:
+        with profile_block(f'plotly_chart.{name}', kind='render'):
+            render_chart_spec(chart_spec, f'chart_{name}')
+    else:
+        st.info("Dados insuficientes para análise")
+
+def show_data_quality(raw, validation):
+    """Exibe o relatório de qualidade da planilha carregada, quando alguma verificação falha."""
+    report = validation.report[validation.report['rows'] > 0]
+    if report.empty:
+        return
+    
+    flagged = validation.flags.to_numpy() != 0
+    st.warning(f"⚠️ {flagged.sum()} registros com problemas de qualidade. "
+               "Registros sem máquina, início, fim ou duração são descartados da análise.")
+    with st.expander("🧪 Qualidade dos Dados"):
+        st.dataframe(
+            report[['description', 'rows', 'examples']].rename(columns={
+                'description': 'Verificação', 'rows': 'Registros', 'examples': 'Exemplos (índice da linha)'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        issues = raw[flagged].assign(Problemas=flag_names(validation.flags[flagged]))
+        st.markdown(
+            get_download_link(issues, 'problemas_qualidade.xlsx', '📥 Baixar registros com problemas'),
+            unsafe_allow_html=True
+        )
+
+@profiled(kind='page')
 def show_dashboard():
     """Exibe a página do painel principal."""
     
@@ -29,11 +83,17 @@ def show_dashboard():
         if uploaded_file is not None:
             try:
                 with st.spinner('Processando dados...'):
-                    df = pd.read_excel(uploaded_file)
-                    st.session_state.df = process_data(df)
+                    with profile_block('dashboard.read_excel'):
+                        df = pd.read_excel(uploaded_file)
+                    st.session_state.df, duplicates = deduplicate_stoppages(process_data(df))
+                    st.session_state.data_source = 'upload'
                     st.success(f"✅ Arquivo carregado com sucesso! {len(st.session_state.df)} registros processados.")
+                if duplicates:
+                    st.warning(f"⚠️ {duplicates} paradas repetidas descartadas (mesma máquina, início, fim e causa).")
+                show_data_quality(df, validate_data(df))
             except Exception as e:
                 st.error(f"❌ Erro ao processar o arquivo: {str(e)}")
+        show_ingestion_status()
         st.markdown('</div>', unsafe_allow_html=True)
     
     # Se dados foram carregados, exibe filtros e análise
@@ -87,10 +147,7 @@ def show_dashboard():
                             area_time = calculate_total_stoppage_time_by_area(filtered_data)
                             monthly_duration = calculate_total_duration_by_month(filtered_data)
                             frequent_stoppages = most_frequent_stoppages(filtered_data)
-                            
-                            # Análise de paradas críticas
-                            critical_stoppages, critical_percentage = identify_critical_stoppages(filtered_data)
-                            top_critical_stoppages = critical_stoppages.groupby('Parada')['Duração'].sum().sort_values(ascending=False).head(10)
+                            duration_histogram = calculate_duration_histogram(filtered_data)
                             
                             # Armazenar resultados no estado da sessão
                             st.session_state.resultados = {
@@ -106,15 +163,13 @@ def show_dashboard():
                                 'pareto': pareto,
                                 'occurrences': occurrences,
                                 'area_time': area_time,
-                                'critical_stoppages': critical_stoppages,
-                                'critical_percentage': critical_percentage,
-                                'top_critical_stoppages': top_critical_stoppages,
                                 'recommendations': recommendations,
                                 'selected_machine': selected_machine,
                                 'selected_month': selected_month,
                                 'scheduled_hours': scheduled_hours,
                                 'frequent_stoppages': frequent_stoppages,
                                 'monthly_duration': monthly_duration,
+                                'duration_histogram': duration_histogram,
                                 'date_range': None
                             }
             
@@ -196,10 +251,7 @@ def show_dashboard():
                                 area_time = calculate_total_stoppage_time_by_area(filtered_data)
                                 monthly_duration = calculate_total_duration_by_month(filtered_data)
                                 frequent_stoppages = most_frequent_stoppages(filtered_data)
-                                
-                                # Análise de paradas críticas
-                                critical_stoppages, critical_percentage = identify_critical_stoppages(filtered_data)
-                                top_critical_stoppages = critical_stoppages.groupby('Parada')['Duração'].sum().sort_values(ascending=False).head(10)
+                                duration_histogram = calculate_duration_histogram(filtered_data)
                                 
                                 # Armazenar resultados no estado da sessão
                                 st.session_state.resultados = {
@@ -215,15 +267,13 @@ def show_dashboard():
                                     'pareto': pareto,
                                     'occurrences': occurrences,
                                     'area_time': area_time,
-                                    'critical_stoppages': critical_stoppages,
-                                    'critical_percentage': critical_percentage,
-                                    'top_critical_stoppages': top_critical_stoppages,
                                     'recommendations': recommendations,
                                     'selected_machine': selected_machine_custom,
                                     'selected_month': None,
                                     'scheduled_hours': scheduled_hours,
                                     'frequent_stoppages': frequent_stoppages,
                                     'monthly_duration': monthly_duration,
+                                    'duration_histogram': duration_histogram,
                                     'date_range': (start_date, end_date)
                                 }
                         else:
@@ -235,23 +285,26 @@ def show_dashboard():
         if 'resultados' in st.session_state and st.session_state.resultados:
             display_analysis_results()
 
-def display_analysis_results():
-    """Exibe os resultados da análise."""
-    results = st.session_state.resultados
-    
-    # Obter texto da máquina e período
-    machine_text = results['selected_machine']
-    
-    if results['date_range']:
-        start_date, end_date = results['date_range']
-        period_text = f"{start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}"
-    else:
-        period_text = get_month_name(results['selected_month'])
-    
-    # Título da seção de resultados
-    st.markdown(f'<div class="section-title">Resultados da Análise: {machine_text} - {period_text}</div>', unsafe_allow_html=True)
+def show_machine_breakdown(results):
+    """Exibe os indicadores de cada máquina (calculados em paralelo em bases grandes)."""
+    scheduled_time = pd.Timedelta(hours=results['scheduled_hours'])
+    breakdown = compute_kpis_by_partition(results['filtered_data'], scheduled_time, by='Máquina')
     
-    # Indicadores principais
+    with st.expander("🏭 Indicadores por Máquina"):
+        if breakdown.empty:
+            st.info("Dados insuficientes para análise")
+            return
+        st.dataframe(
+            breakdown.drop(columns='Tempo Programado (h)'),
+            column_config={
+                column: st.column_config.NumberColumn(column, format="%d" if column == 'Total de Paradas' else "%.1f")
+                for column in breakdown.columns
+            },
+            use_container_width=True
+        )
+
+def show_metric_boxes(results):
+    """Exibe os indicadores principais (disponibilidade, MTBF e MTTR)."""
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -286,6 +339,67 @@ def display_analysis_results():
             """, 
             unsafe_allow_html=True
         )
+
+def show_duration_percentiles(results):
+    """Exibe os percentis de duração das paradas, combinando os esboços de quantis da seleção."""
+    if 'duration_sketches' not in results:
+        machine, month, start_date, end_date = analysis_selection(results)
+        results['duration_sketches'] = filter_partitions(
+            build_duration_sketches(st.session_state.df), machine, month, start_date, end_date
+        )
+    sketches = results['duration_sketches']
+    t = get_translation()
+    
+    with st.expander(f"⏱️ {t('duration_percentiles')}"):
+        if sketches.empty:
+            st.info(t('insufficient_data'))
+            return
+        
+        overall = sketch_quantiles(sketches).iloc[0]
+        columns = st.columns(len(overall))
+        for column, (label, minutes) in zip(columns, overall.items()):
+            column.metric(label.upper(), f"{minutes:.1f} min")
+        
+        groups = {t('by_machine'): 'Máquina', t('by_area'): 'Área Responsável', t('by_cause'): 'Parada'}
+        for tab, level in zip(st.tabs(list(groups)), groups.values()):
+            with tab:
+                st.dataframe(
+                    sketch_quantiles(sketches, by=level),
+                    column_config={
+                        label: st.column_config.NumberColumn(f"{label.upper()} (min)", format="%.1f")
+                        for label in overall.index
+                    },
+                    use_container_width=True
+                )
+        st.caption(t('approximate_percentiles').format(accuracy=RELATIVE_ACCURACY))
+
+@profiled(kind='page')
+def display_analysis_results():
+    """Exibe os resultados da análise."""
+    results = st.session_state.resultados
+    
+    # Versão dos dados usada na análise (modo ao vivo)
+    results.setdefault('live_version', st.session_state.get('dataset_version'))
+    
+    # Obter texto da máquina e período
+    machine_text = results['selected_machine']
+    
+    if results['date_range']:
+        start_date, end_date = results['date_range']
+        period_text = f"{start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}"
+    else:
+        period_text = get_month_name(results['selected_month'])
+    
+    # Título da seção de resultados
+    st.markdown(f'<div class="section-title">Resultados da Análise: {machine_text} - {period_text}</div>', unsafe_allow_html=True)
+    
+    # Modo ao vivo: indicadores e tendências acompanham os dados da pasta monitorada
+    live = show_live_toggle()
+    if live:
+        refresh_live_results(results)
+    
+    # Indicadores principais
+    run_live_block(show_metric_boxes, live)
     
     # Resumo da análise
     with st.container():
@@ -307,6 +421,13 @@ def display_analysis_results():
         
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Indicadores individuais quando todas as máquinas são analisadas
+    if machine_text == "Todas":
+        show_machine_breakdown(results)
+    
+    # Percentis de duração (esboços de quantis mescláveis)
+    show_duration_percentiles(results)
+    
     # Tabelas de resumo
     st.markdown('<div class="section-title">Tabelas de Resumo</div>', unsafe_allow_html=True)
     
@@ -365,95 +486,20 @@ def display_analysis_results():
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    # Análise temporal
-    st.markdown('<div class="section-title">Análise Temporal</div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_occurrences = create_occurrences_chart(results['occurrences'])
-        if fig_occurrences:
-            st.plotly_chart(fig_occurrences, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_monthly_duration = create_monthly_duration_chart(results['monthly_duration'])
-        if fig_monthly_duration:
-            st.plotly_chart(fig_monthly_duration, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Análise gráfica
-    st.markdown('<div class="section-title">Análise Gráfica</div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_pareto = create_pareto_chart(results['pareto'])
-        if fig_pareto:
-            st.plotly_chart(fig_pareto, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_area = create_area_pie_chart(results['area_index'])
-        if fig_area:
-            st.plotly_chart(fig_area, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Segunda linha de gráficos
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_area_time = create_area_time_chart(results['area_time'])
-        if fig_area_time:
-            st.plotly_chart(fig_area_time, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_distribution = create_duration_distribution_chart(results['filtered_data'])
-        if fig_distribution:
-            st.plotly_chart(fig_distribution, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Análise de paradas críticas
-    st.markdown('<div class="section-title">Análise de Paradas Críticas</div>', unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_critical_stoppages = create_critical_stoppages_chart(results['top_critical_stoppages'])
-        if fig_critical_stoppages:
-            st.plotly_chart(fig_critical_stoppages, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        fig_critical_areas = create_critical_areas_pie_chart(results['critical_stoppages'])
-        if fig_critical_areas:
-            st.plotly_chart(fig_critical_areas, use_container_width=True)
-        else:
-            st.info("Dados insuficientes para análise")
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Seções de gráficos: apenas a seção ativa tem suas figuras construídas e enviadas
+    chart_sections = {
+        "📈 Análise Temporal": show_temporal_section,
+        "📊 Análise Gráfica": show_graphical_section,
+        "⚠️ Paradas Críticas": show_critical_section
+    }
+    selected_section = st.radio(
+        "Seção de gráficos",
+        list(chart_sections.keys()),
+        horizontal=True,
+        key="dashboard_chart_section",
+        label_visibility="collapsed"
+    )
+    run_live_block(chart_sections[selected_section], live)
     
     # Recomendações
     st.markdown('<div class="section-title">Recomendações</div>', unsafe_allow_html=True)
@@ -482,10 +528,14 @@ def display_analysis_results():
             )
         
         with col2:
-            # Exportar paradas críticas
-            if not results['critical_stoppages'].empty:
+            # Exportar paradas críticas (acima do limite escolhido na seção de paradas críticas)
+            hour_limit = st.session_state.get('dashboard_critical_limit', CRITICAL_LIMIT_MINUTES) / 60
+            critical_stoppages, _ = identify_critical_stoppages(
+                results['filtered_data'], hour_limit, get_duration_index(results)
+            )
+            if not critical_stoppages.empty:
                 st.markdown(
-                    get_download_link(results['critical_stoppages'], 'paradas_criticas.xlsx', '📥 Baixar paradas críticas'),
+                    get_download_link(critical_stoppages, 'paradas_criticas.xlsx', '📥 Baixar paradas críticas'),
                     unsafe_allow_html=True
                 )
         
@@ -498,4 +548,294 @@ def display_analysis_results():
             if st.button("Limpar Dados", key="btn_clear", use_container_width=True):
                 st.session_state.resultados = None
                 st.session_state.df = None
-                st.rerun()
\ No newline at end of file
+                st.session_state.data_source = None
+                st.session_state.dataset_version = None
+                st.rerun()
+
+def analysis_selection(results):
+    """Retorna a seleção da análise: (máquina, mês, início, fim) no formato de filter_data."""
+    start_date = end_date = None
+    if results['date_range']:
+        start_date = datetime.combine(results['date_range'][0], datetime.min.time())
+        end_date = datetime.combine(results['date_range'][1], datetime.max.time())
+    return results['selected_machine'], results['selected_month'], start_date, end_date
+
+def show_live_toggle():
+    """Exibe a opção de modo ao vivo quando os dados vêm da pasta monitorada."""
+    if get_service() is None or st.session_state.get('data_source') != 'ingestion':
+        return False
+    return st.toggle(f"🔴 Ao vivo (atualiza a cada {LIVE_REFRESH_SECONDS:.0f}s)", key="dashboard_live")
+
+def run_live_block(render, live):
+    """Exibe um bloco de resultados; no modo ao vivo ele é um fragmento reexecutado periodicamente."""
+    fragment = getattr(st, 'fragment', None)
+    if live and fragment is not None:
+        fragment(show_live_block, run_every=LIVE_REFRESH_SECONDS)(render)
+    else:
+        render(st.session_state.resultados)
+
+def show_live_block(render):
+    """Incorpora as paradas novas aos resultados e exibe o bloco."""
+    results = st.session_state.resultados
+    if results:
+        refresh_live_results(results)
+        render(results)
+
+def refresh_live_results(results):
+    """
+    Atualiza os resultados com a versão mais recente dos dados da pasta monitorada.
+    
+    Os indicadores e resumos vêm dos agregados por partição mantidos pela ingestão
+    (atualizados apenas nas partições afetadas pelas paradas novas), sem recalcular
+    a análise sobre o histórico completo.
+    """
+    service = get_service()
+    if service is None or results.get('live_version') == service.version:
+        return
+    
+    version, dataset, partitions, sketches = service.aggregates()
+    results['live_version'] = version
+    if dataset is None:
+        return
+    st.session_state.df = dataset
+    st.session_state.dataset_version = version
+    
+    machine, month, start_date, end_date = analysis_selection(results)
+    selected = filter_partitions(partitions, machine, month, start_date, end_date)
+    scheduled_time, results['scheduled_hours'] = scheduled_time_from_partitions(selected, month, start_date, end_date)
+    results.update(kpis_from_partitions(selected, scheduled_time))
+    results['duration_sketches'] = filter_partitions(sketches, machine, month, start_date, end_date)
+    
+    # Linhas usadas na análise de paradas críticas e nas exportações
+    results['filtered_data'] = filter_data(dataset, machine, month, start_date, end_date)
+    
+    # Figuras, séries temporais e índice de durações são reconstruídos no próximo acesso
+    results.pop('duration_index', None)
+    results.pop('pareto_cube', None)
+    results.pop('figures', None)
+    results.pop('fingerprint', None)
+    results.pop('time_series', None)
+
+def results_fingerprint(results):
+    """Impressão digital dos dados analisados, da qual todos os gráficos do resultado derivam."""
+    if 'fingerprint' not in results:
+        results['fingerprint'] = fingerprint(results['filtered_data'])
+    return results['fingerprint']
+
+def get_figure(results, name, builder, data):
+    """
+    Retorna o gráfico serializado do resultado.
+    
+    A serialização fica no cache compartilhado por (impressão digital, gráfico, idioma)
+    e é memoizada no resultado; as reexecuções seguintes não constroem nem serializam
+    o gráfico novamente.
+    """
+    figures = results.setdefault('figures', {})
+    if name not in figures:
+        figures[name] = get_chart_spec(results_fingerprint(results), name, 'pt', lambda: builder(data))
+    return figures[name]
+
+def show_chart(results, name, builder, data_key):
+    """Exibe um gráfico do resultado dentro de um container padrão."""
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    render_chart(get_figure(results, name, builder, results[data_key]), name)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Granularidades da análise temporal (None: série mensal do resultado)
+TREND_GRANULARITIES = {"Mensal": None, "Diária": 'D', "Horária": 'h'}
+
+def get_time_series(results, freq):
+    """Retorna a série diária ou horária do resultado, calculada apenas no primeiro acesso."""
+    series = results.setdefault('time_series', {})
+    if freq not in series:
+        series[freq] = calculate_stoppage_time_series(results['filtered_data'], freq)
+    return series[freq]
+
+def show_trend_charts(results, freq):
+    """
+    Exibe as tendências diárias ou horárias.
+    
+    As séries longas são reduzidas no servidor a cerca de um ponto por pixel; ao
+    escolher uma janela menor, ela é exibida com mais detalhe (em resolução completa
+    quando cabe no limite de pontos), e a opção de resolução completa envia todos os
+    pontos da janela.
+    """
+    time_series = get_time_series(results, freq)
+    if len(time_series) <= 1:
+        st.info("Dados insuficientes para análise")
+        return
+    
+    first, last = time_series.index[0].to_pydatetime(), time_series.index[-1].to_pydatetime()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        window = st.slider(
+            "Janela",
+            min_value=first,
+            max_value=last,
+            value=(first, last),
+            step=timedelta(days=1) if freq == 'D' else timedelta(hours=1),
+            format="DD/MM/YYYY" if freq == 'D' else "DD/MM/YYYY HH:mm",
+            key=f"trend_window_{freq}_{first:%Y%m%d%H}_{last:%Y%m%d%H}"
+        )
+    with col2:
+        full_resolution = st.toggle(
+            "Resolução completa",
+            key="trend_full_resolution",
+            help="Envia todos os pontos da janela selecionada (desenhados com WebGL quando são muitos)"
+        )
+    
+    selected = time_series.loc[window[0]:window[1]]
+    max_points = None if full_resolution else TREND_MAX_POINTS
+    for column in ['Paradas', 'Duração (h)']:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        chart = f'trend_{column}_{freq}_{window[0]:%Y%m%d%H}_{window[1]:%Y%m%d%H}_{max_points}'
+        chart_spec = get_chart_spec(
+            results_fingerprint(results), chart, 'pt',
+            lambda: create_trend_chart(selected, column, freq, max_points)
+        )
+        render_chart(chart_spec, f'trend_{column}_{freq}')
+        st.markdown('</div>', unsafe_allow_html=True)
+
+def show_temporal_section(results):
+    """Exibe a seção de análise temporal."""
+    st.markdown('<div class="section-title">Análise Temporal</div>', unsafe_allow_html=True)
+    
+    granularity = st.radio(
+        "Granularidade",
+        list(TREND_GRANULARITIES.keys()),
+        horizontal=True,
+        key="dashboard_trend_granularity"
+    )
+    freq = TREND_GRANULARITIES[granularity]
+    if freq is not None:
+        show_trend_charts(results, freq)
+        return
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart(results, 'occurrences', create_occurrences_chart, 'occurrences')
+    
+    with col2:
+        show_chart(results, 'monthly_duration', create_monthly_duration_chart, 'monthly_duration')
+
+def show_graphical_section(results):
+    """Exibe a seção de análise gráfica."""
+    st.markdown('<div class="section-title">Análise Gráfica</div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart(results, 'pareto', create_pareto_chart, 'pareto')
+    
+    with col2:
+        show_chart(results, 'area', create_area_pie_chart, 'area_index')
+    
+    # Segunda linha de gráficos
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_chart(results, 'area_time', create_area_time_chart, 'area_time')
+    
+    with col2:
+        show_chart(results, 'distribution', create_duration_distribution_chart, 'duration_histogram')
+    
+    show_pareto_drilldown(results)
+
+# Rótulos dos níveis do detalhamento do Pareto
+DRILL_LABELS = {'Área Responsável': 'Área', 'Parada': 'Causa', 'Máquina': 'Máquina', 'Turno': 'Turno'}
+
+def get_pareto_cube(results):
+    """Retorna o cubo área × causa × máquina × turno do resultado, montado apenas no primeiro acesso."""
+    if 'pareto_cube' not in results:
+        results['pareto_cube'] = build_pareto_cube(results['filtered_data'])
+    return results['pareto_cube']
+
+def show_pareto_drilldown(results):
+    """
+    Exibe o detalhamento do Pareto (área → causa → máquina → turno).
+    
+    Cada escolha mostra o Pareto do nível seguinte, calculado sobre o cubo agregado
+    do resultado, sem reler as paradas nem refazer a análise.
+    """
+    cube = get_pareto_cube(results)
+    
+    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+    st.markdown("#### 🔎 Detalhamento do Pareto")
+    
+    path = []
+    for column, level in zip(st.columns(len(DRILL_LEVELS) - 1), DRILL_LEVELS[:-1]):
+        options = drill_down(cube, path, n=None).index.tolist()
+        with column:
+            # A chave inclui o caminho: ao trocar um nível, os seguintes voltam para "Todas"
+            choice = st.selectbox(
+                DRILL_LABELS[level],
+                ["Todas"] + options,
+                key=f"pareto_drill_{len(path)}_{'|'.join(map(str, path))}"
+            )
+        if choice == "Todas":
+            break
+        path.append(choice)
+    
+    level_label = DRILL_LABELS[DRILL_LEVELS[len(path)]]
+    title = f"Pareto por {level_label}" + (f" — {' › '.join(map(str, path))}" if path else "")
+    chart_spec = get_chart_spec(
+        results_fingerprint(results), f"pareto_drill_{'|'.join(map(str, path))}", 'pt',
+        lambda: create_pareto_chart(drill_down(cube, path)['Duração'], category_label=level_label, title=title)
+    )
+    render_chart(chart_spec, 'pareto_drill')
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Limite padrão e faixa do controle de paradas críticas (minutos)
+CRITICAL_LIMIT_MINUTES = CRITICAL_HOUR_LIMIT * 60
+CRITICAL_LIMIT_RANGE = (5, 480, 5)
+
+def get_duration_index(results):
+    """Retorna o índice de paradas ordenadas por duração do resultado, montado apenas no primeiro acesso."""
+    if 'duration_index' not in results:
+        results['duration_index'] = build_duration_index(results['filtered_data'])
+    return results['duration_index']
+
+def show_critical_section(results):
+    """
+    Exibe a seção de análise de paradas críticas.
+    
+    O limite é ajustável: as paradas acima dele são um sufixo do índice ordenado por
+    duração, de modo que mover o controle não percorre nem copia os dados analisados.
+    """
+    st.markdown('<div class="section-title">Análise de Paradas Críticas</div>', unsafe_allow_html=True)
+    
+    minimum, maximum, step = CRITICAL_LIMIT_RANGE
+    limit_minutes = st.slider(
+        "Limite de parada crítica (minutos)",
+        min_value=minimum,
+        max_value=maximum,
+        value=CRITICAL_LIMIT_MINUTES,
+        step=step,
+        key="dashboard_critical_limit"
+    )
+    index = get_duration_index(results)
+    hour_limit = limit_minutes / 60
+    critical_count = len(index.durations) - critical_start(index, hour_limit)
+    percentage = critical_count / index.total * 100 if index.total else 0
+    st.caption(f"{critical_count} paradas críticas ({percentage:.1f}% do total)")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        chart_spec = get_chart_spec(
+            results_fingerprint(results), f'critical_stoppages_{limit_minutes}', 'pt',
+            lambda: create_critical_stoppages_chart(top_critical_stoppages(index, hour_limit), limit_minutes)
+        )
+        render_chart(chart_spec, 'critical_stoppages')
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        chart_spec = get_chart_spec(
+            results_fingerprint(results), f'critical_areas_{limit_minutes}', 'pt',
+            lambda: create_critical_areas_pie_chart(critical_area_counts(index, hour_limit))
+        )
+        render_chart(chart_spec, 'critical_areas')
+        st.markdown('</div>', unsafe_allow_html=True)
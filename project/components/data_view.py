@@ -1,15 +1,63 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime, timedelta
-from utils.data_processing import get_download_link
-from utils.i18n import get_translation
+from utils.data_processing import get_download_link, filter_data
+from utils.data_grid import get_page
+from utils.aggregations import summarize_by_machine, summarize_by_weekday, summarize_by_hour
+from utils.i18n import get_translation, get_formatter, current_language
+from core.calendar_labels import weekday_labels
 from utils.calculations import calculate_shifts_distribution
 from utils.visualizations import create_shifts_distribution_chart
+from utils.lazy_imports import LazyModule
+from utils.profiling import profiled
 
+px = LazyModule('plotly.express')
+
+def show_paginated_grid(df, t):
+    """Display df one page at a time; sorting and filtering run server-side."""
+    columns = df.columns.tolist()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        sort_column = st.selectbox(t('sort_by'), ["—"] + columns, key="grid_sort_column")
+        descending = st.checkbox(t('descending'), key="grid_descending")
+    
+    with col2:
+        filter_column = st.selectbox(t('filter_column'), columns, key="grid_filter_column")
+    
+    with col3:
+        filter_value = st.text_input(t('filter_value'), key="grid_filter_value")
+    
+    with col4:
+        page_size = st.selectbox(t('rows_per_page'), [25, 50, 100, 250, 500], index=1, key="grid_page_size")
+    
+    sort_column = None if sort_column == "—" else sort_column
+    filters = {filter_column: filter_value} if filter_value else None
+    
+    # Count matching rows first to bound the page selector
+    _, total_rows = get_page(df, 1, 0, sort_column, not descending, filters)
+    total_pages = max(1, -(-total_rows // page_size))
+    
+    page_col, info_col = st.columns([1, 3])
+    with page_col:
+        page = st.number_input(t('page'), min_value=1, max_value=total_pages, value=1, step=1, key="grid_page")
+    with info_col:
+        st.markdown(f"<br>{t('page')} {page} / {total_pages} · {total_rows} {t('records')}", unsafe_allow_html=True)
+    
+    page_data, _ = get_page(df, page, page_size, sort_column, not descending, filters)
+    st.dataframe(
+        page_data,
+        use_container_width=True,
+        hide_index=True,
+        height=400
+    )
+
+@profiled(kind='page')
 def show_data_view():
     """Display the data view page."""
     t = get_translation()
+    fmt = get_formatter()
     
     if st.session_state.df is not None:
         st.markdown(f'<div class="section-title">{t("data_visualization")}</div>', unsafe_allow_html=True)
@@ -57,29 +105,32 @@ def show_data_view():
                         st.error("A data inicial não pode ser posterior à data final")
             
             # Apply filters
-            filtered_data = st.session_state.df.copy()
-            
-            if machine_filter != t('all'):
-                filtered_data = filtered_data[filtered_data['Máquina'] == machine_filter]
-            
-            if not use_date_range and month_filter != t('all'):
-                filtered_data = filtered_data[filtered_data['Ano-Mês'] == month_filter]
-            elif use_date_range and start_date <= end_date:
-                start_datetime = datetime.combine(start_date, datetime.min.time())
-                end_datetime = datetime.combine(end_date, datetime.max.time())
-                filtered_data = filtered_data[
-                    (filtered_data['Inicio'] >= start_datetime) & 
-                    (filtered_data['Inicio'] <= end_datetime)
-                ]
+            if use_date_range and start_date <= end_date:
+                filtered_data = filter_data(
+                    st.session_state.df,
+                    machine_filter,
+                    start_date=datetime.combine(start_date, datetime.min.time()),
+                    end_date=datetime.combine(end_date, datetime.max.time())
+                )
+            else:
+                filtered_data = filter_data(
+                    st.session_state.df,
+                    machine_filter,
+                    month=None if use_date_range or month_filter == t('all') else month_filter
+                )
             
             # Display filtered data
-            st.markdown(f"**{t('showing')} {len(filtered_data)} {t('records')}**")
-            st.dataframe(
-                filtered_data,
-                use_container_width=True,
-                hide_index=True,
-                height=400
-            )
+            st.markdown(f"**{t('showing')} {fmt.number(len(filtered_data), 0)} {t('records')}**")
+            
+            if st.checkbox(t('server_pagination'), value=True, key="data_server_pagination"):
+                show_paginated_grid(filtered_data, t)
+            else:
+                st.dataframe(
+                    filtered_data,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400
+                )
             
             # Download button
             st.markdown(
@@ -94,30 +145,26 @@ def show_data_view():
         with st.container():
             st.markdown('<div class="content-box">', unsafe_allow_html=True)
             # Machine summary
-            machine_summary = filtered_data.groupby('Máquina').agg({
-                'Duração': ['count', 'sum', 'mean']
+            total_hours_label = f"{t('total_duration')} ({t('hours')})"
+            average_hours_label = f"{t('average_duration')} ({t('hours')})"
+            machine_summary = summarize_by_machine(filtered_data).rename(columns={
+                'count': t('number_of_stoppages'),
+                'total_hours': total_hours_label,
+                'mean_hours': average_hours_label
             })
-            machine_summary.columns = [t('number_of_stoppages'), t('total_duration'), t('average_duration')]
             
-            # Convert to hours
-            machine_summary[f"{t('total_duration')} ({t('hours')})"] = machine_summary[t('total_duration')].apply(lambda x: x.total_seconds() / 3600)
-            machine_summary[f"{t('average_duration')} ({t('hours')})"] = machine_summary[t('average_duration')].apply(lambda x: x.total_seconds() / 3600)
-            
-            st.dataframe(
-                machine_summary[[t('number_of_stoppages'), f"{t('total_duration')} ({t('hours')})", f"{t('average_duration')} ({t('hours')})"]], 
-                use_container_width=True
-            )
+            st.dataframe(machine_summary, use_container_width=True)
             
             # Create summary chart
             if len(machine_summary) > 1:  # Only create chart if there's more than one machine
                 fig_summary = px.bar(
                     machine_summary.reset_index(),
                     x='Máquina',
-                    y=f"{t('total_duration')} ({t('hours')})",
+                    y=total_hours_label,
                     color='Máquina',
                     title=t('total_duration_by_machine'),
-                    labels={'Máquina': t('machine'), f"{t('total_duration')} ({t('hours')})": f"{t('total_duration')} ({t('hours')})"},
-                    text=f"{t('total_duration')} ({t('hours')})"
+                    labels={'Máquina': t('machine'), total_hours_label: total_hours_label},
+                    text=total_hours_label
                 )
                 
                 fig_summary.update_traces(
@@ -161,34 +208,16 @@ def show_data_view():
             ])
             
             with tab1:
-                # Add weekday column
-                filtered_data['Dia da Semana'] = filtered_data['Inicio'].dt.day_name()
-                
-                # Weekday order starting from Sunday
-                weekday_order = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-                
-                # Mapping to localized names based on language
-                if st.session_state.language == 'pt':
-                    weekday_names = ['Domingo', 'Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']
-                else:
-                    weekday_names = weekday_order
-                
-                weekday_mapping = dict(zip(weekday_order, weekday_names))
-                filtered_data['Dia da Semana Localizado'] = filtered_data['Dia da Semana'].map(weekday_mapping)
-                
-                # Group by weekday
-                stoppages_by_day = filtered_data.groupby('Dia da Semana Localizado').agg({
-                    'Duração': ['count', 'sum']
-                })
-                stoppages_by_day.columns = [t('number_of_stoppages'), t('total_duration')]
-                
-                # Convert to hours
-                stoppages_by_day[f"{t('duration')} ({t('hours')})"] = stoppages_by_day[t('total_duration')].apply(lambda x: x.total_seconds() / 3600)
+                # Aggregate on the precomputed weekday codes and label the 7 codes through a lookup
+                stoppages_by_day = summarize_by_weekday(filtered_data)
+                stoppages_by_day = (
+                    stoppages_by_day
+                    .set_axis(weekday_labels(stoppages_by_day.index, current_language()).astype(str), axis=0)
+                    .rename_axis('Dia da Semana Localizado')
+                    .set_axis([t('number_of_stoppages'), f"{t('duration')} ({t('hours')})"], axis=1)
+                )
                 
-                # Reorder index according to weekdays
                 if not stoppages_by_day.empty:
-                    stoppages_by_day = stoppages_by_day.reindex(weekday_names)
-                    
                     # Create chart
                     fig_days = px.bar(
                         stoppages_by_day.reset_index(),
@@ -231,17 +260,12 @@ def show_data_view():
                     st.info(t('insufficient_data'))
             
             with tab2:
-                # Add hour of day column
-                filtered_data['Hora do Dia'] = filtered_data['Inicio'].dt.hour
-                
-                # Group by hour
-                stoppages_by_hour = filtered_data.groupby('Hora do Dia').agg({
-                    'Duração': ['count', 'sum']
-                })
-                stoppages_by_hour.columns = [t('number_of_stoppages'), t('total_duration')]
-                
-                # Convert to hours
-                stoppages_by_hour[f"{t('duration')} ({t('hours')})"] = stoppages_by_hour[t('total_duration')].apply(lambda x: x.total_seconds() / 3600)
+                # Group by the precomputed hour of day
+                stoppages_by_hour = (
+                    summarize_by_hour(filtered_data)
+                    .rename_axis('Hora do Dia')
+                    .set_axis([t('number_of_stoppages'), f"{t('duration')} ({t('hours')})"], axis=1)
+                )
                 
                 # Create chart
                 if not stoppages_by_hour.empty:
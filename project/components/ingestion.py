@@ -0,0 +1,47 @@
+import streamlit as st
+from core.ingestion import get_service
+
+
+def sync_ingested_data():
+    """
+    Carrega na sessão a versão mais recente dos dados da pasta monitorada.
+    
+    Dados enviados manualmente pelo usuário têm prioridade e não são substituídos.
+    """
+    service = get_service()
+    if service is None or st.session_state.get('data_source') == 'upload':
+        return
+    
+    version, dataset = service.snapshot()
+    if dataset is None or st.session_state.get('dataset_version') == version:
+        return
+    
+    first_version = st.session_state.get('dataset_version') is None
+    st.session_state.df = dataset
+    st.session_state.dataset_version = version
+    st.session_state.data_source = 'ingestion'
+    
+    if not first_version:
+        message = f"📥 Novos dados recebidos (versão {version})."
+        if st.session_state.get('resultados') and not st.session_state.get('dashboard_live'):
+            message += " Clique em Analisar para atualizar os resultados."
+        st.toast(message)
+
+
+def show_ingestion_status():
+    """Exibe a origem dos dados quando a ingestão automática está ativa."""
+    service = get_service()
+    if service is None:
+        return
+    
+    if st.session_state.get('data_source') == 'upload':
+        st.caption(f"📂 Ingestão automática de `{service.directory}` pausada: usando o arquivo enviado.")
+        return
+    
+    changes = service.changes()
+    last_update = next((change['time'] for change in changes if change['event'] != 'erro'), None)
+    if last_update is None:
+        st.caption(f"📂 Aguardando planilhas na pasta `{service.directory}`...")
+    else:
+        st.caption(f"📂 Ingestão automática de `{service.directory}`: versão {service.version}, "
+                   f"atualizada em {last_update.strftime('%d/%m/%Y %H:%M')}.")
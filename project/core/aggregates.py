@@ -0,0 +1,246 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.calculations import calculate_scheduled_time, shift_codes, SHIFT_NAMES
+
+# Agregados mescláveis por partição (máquina, dia, área, causa): contagens, somas de
+# duração, paradas críticas e primeiro/último início. Novas paradas atualizam apenas
+# as partições afetadas e os indicadores do painel são derivados dos agregados, sem
+# reprocessar o histórico.
+PARTITION_KEYS = ['Máquina', 'Dia', 'Área Responsável', 'Parada']
+
+AGGREGATE_COLUMNS = ['count', 'duration', 'critical_count', 'critical_duration', 'first', 'last']
+
+def build_partitions(df, hour_limit=1):
+    """
+    Calcula os agregados por partição de um conjunto de paradas.
+
+    Args:
+        df: DataFrame com os dados de parada
+        hour_limit: Limite (horas) acima do qual uma parada é crítica
+
+    Returns:
+        pd.DataFrame: Colunas de AGGREGATE_COLUMNS indexadas por PARTITION_KEYS
+    """
+    if df.empty:
+        index = pd.MultiIndex.from_arrays([[]] * len(PARTITION_KEYS), names=PARTITION_KEYS)
+        return pd.DataFrame(columns=AGGREGATE_COLUMNS, index=index)
+
+    duration = df['Duração']
+    critical = duration > pd.Timedelta(hours=hour_limit)
+    keys = [df['Máquina'], df['Inicio'].dt.normalize().rename('Dia'), df['Área Responsável'], df['Parada']]
+
+    frame = pd.DataFrame({
+        'count': 1,
+        'duration': duration,
+        'critical_count': critical.astype('int64'),
+        'critical_duration': duration.where(critical, pd.Timedelta(0)),
+        'first': df['Inicio'],
+        'last': df['Inicio'],
+    }, index=df.index)
+
+    return frame.groupby(keys, dropna=False, observed=True).agg({
+        'count': 'sum',
+        'duration': 'sum',
+        'critical_count': 'sum',
+        'critical_duration': 'sum',
+        'first': 'min',
+        'last': 'max',
+    })
+
+def merge_partitions(partitions, new_partitions):
+    """
+    Combina agregados novos aos existentes, alterando apenas as partições afetadas.
+
+    Os DataFrames recebidos não são modificados.
+    """
+    if partitions.empty:
+        return new_partitions
+    if new_partitions.empty:
+        return partitions
+
+    touched = new_partitions.index.isin(partitions.index)
+    updates = new_partitions[touched]
+    merged = partitions.copy()
+
+    if not updates.empty:
+        current = merged.loc[updates.index]
+        for column in ['count', 'duration', 'critical_count', 'critical_duration']:
+            merged.loc[updates.index, column] = current[column] + updates[column]
+        merged.loc[updates.index, 'first'] = current['first'].where(current['first'] <= updates['first'], updates['first'])
+        merged.loc[updates.index, 'last'] = current['last'].where(current['last'] >= updates['last'], updates['last'])
+
+    return pd.concat([merged, new_partitions[~touched]])
+
+def update_partitions(partitions, new_rows, hour_limit=1):
+    """Incorpora novas paradas aos agregados por partição."""
+    return merge_partitions(partitions, build_partitions(new_rows, hour_limit))
+
+def filter_partitions(partitions, machine=None, month=None, start_date=None, end_date=None):
+    """Seleciona as partições de uma máquina, mês ou intervalo de datas (como filter_data)."""
+    if partitions.empty:
+        return partitions
+
+    index = partitions.index
+    mask = np.ones(len(partitions), dtype=bool)
+    if machine and machine not in ["Todas", "All"]:
+        # Compara os códigos do nível, sem materializar os nomes das máquinas
+        level = index.names.index('Máquina')
+        mask &= index.codes[level] == index.levels[level].get_indexer([machine])[0]
+
+    days = index.get_level_values('Dia')
+    if month and month not in ["Todos", "All"]:
+        month_start = pd.Timestamp(f"{month}-01")
+        mask &= (days >= month_start) & (days < month_start + pd.offsets.MonthBegin())
+    if start_date and end_date:
+        # Partições são diárias: os limites de um intervalo de dias completos coincidem com elas
+        mask &= (days >= pd.Timestamp(start_date).normalize()) & (days <= pd.Timestamp(end_date))
+
+    return partitions[mask]
+
+def scheduled_time_from_partitions(partitions, month_selected=None, start_date=None, end_date=None):
+    """Calcula o tempo programado do período, como calculate_scheduled_time, a partir dos agregados."""
+    span = pd.DataFrame({'Inicio': [partitions['first'].min(), partitions['last'].max()]} if not partitions.empty else {'Inicio': []})
+    return calculate_scheduled_time(span, month_selected, start_date, end_date)
+
+def _top(series, n=10):
+    return series.sort_values(ascending=False).head(n)
+
+def kpis_from_partitions(partitions, scheduled_time):
+    """
+    Deriva os indicadores e resumos do painel a partir dos agregados por partição.
+
+    Produz os mesmos valores de calculate_availability, calculate_mtbf_mttr,
+    calculate_average_downtime, identify_critical_stoppages e das funções de resumo
+    (Pareto, áreas, ocorrências e duração mensal) sobre os dados completos.
+    """
+    count = int(partitions['count'].sum())
+    total_duration = partitions['duration'].sum() if count else pd.Timedelta(0)
+
+    areas = partitions.index.get_level_values('Área Responsável')
+    pcp = areas == 'PCP'
+    pcp_duration = partitions['duration'][pcp].sum() if pcp.any() else pd.Timedelta(0)
+    non_pcp_count = int(partitions['count'][~pcp].sum())
+    non_pcp_duration = partitions['duration'][~pcp].sum() if non_pcp_count else pd.Timedelta(0)
+
+    num_machines = max(1, partitions.index.get_level_values('Máquina').nunique())
+    adjusted_scheduled_time = scheduled_time * num_machines - pcp_duration
+
+    availability = 0
+    if count and adjusted_scheduled_time.total_seconds() > 0:
+        availability = (adjusted_scheduled_time - non_pcp_duration) / adjusted_scheduled_time * 100
+        availability = max(0, min(100, availability))
+
+    mtbf = (adjusted_scheduled_time - non_pcp_duration).total_seconds() / 3600 / non_pcp_count if non_pcp_count > 1 else 0
+    mttr = non_pcp_duration.total_seconds() / 3600 / non_pcp_count if non_pcp_count > 0 else 0
+
+    if not count:
+        empty = pd.Series(dtype='float64')
+        summaries = dict.fromkeys(['area_index', 'pareto', 'frequent_stoppages', 'area_time',
+                                   'top_critical_stoppages', 'occurrences', 'monthly_duration'], empty)
+    else:
+        causes = partitions.index.get_level_values('Parada')
+        months = partitions.index.get_level_values('Dia').strftime('%Y-%m').rename('Ano-Mês')
+        area_counts = partitions['count'].groupby(areas).sum()
+        critical = partitions['critical_count'].to_numpy() > 0
+        critical_by_cause = partitions['critical_duration'][critical].groupby(causes[critical], observed=True).sum()
+        summaries = {
+            'area_index': _top(area_counts, len(area_counts)) / area_counts.sum() * 100,
+            'pareto': _top(partitions['duration'].groupby(causes, observed=True).sum()),
+            'frequent_stoppages': _top(partitions['count'].groupby(causes, observed=True).sum()),
+            'area_time': partitions['duration'].groupby(areas).sum(),
+            'top_critical_stoppages': _top(critical_by_cause),
+            'occurrences': partitions['count'].groupby(months).sum(),
+            'monthly_duration': partitions['duration'].groupby(months).sum(),
+        }
+
+    return {
+        'availability': availability,
+        'mtbf': mtbf,
+        'mttr': mttr,
+        'total_stoppages': count,
+        'total_downtime': total_duration,
+        'total_downtime_hours': total_duration.total_seconds() / 3600,
+        'average_time': total_duration / count if count else pd.Timedelta(0),
+        'critical_percentage': partitions['critical_count'].sum() / count * 100 if count else 0,
+        **summaries,
+    }
+
+# Níveis do detalhamento do Pareto, do mais geral ao mais específico
+DRILL_LEVELS = ['Área Responsável', 'Parada', 'Máquina', 'Turno']
+
+# Cubo do Pareto: labels (valores distintos de cada nível de DRILL_LEVELS), codes
+# (matriz células × níveis, -1 onde o valor falta), duration (soma das durações
+# em ns) e count (paradas) de cada combinação área × causa × máquina × turno
+ParetoCube = namedtuple('ParetoCube', ['labels', 'codes', 'duration', 'count'])
+
+def _level_codes(df, level):
+    if level == 'Turno':
+        return shift_codes(df['Inicio'].dt.hour.to_numpy()), pd.Index(SHIFT_NAMES)
+    if level not in df.columns:
+        return np.full(len(df), -1), pd.Index([])
+    codes, uniques = pd.factorize(df[level])
+    return codes, pd.Index(uniques)
+
+def build_pareto_cube(df):
+    """
+    Agrega as paradas por área × causa × máquina × turno para o detalhamento do Pareto.
+
+    O cubo tem uma linha por combinação existente (alguns milhares, mesmo com milhões
+    de paradas), de modo que cada nível do detalhamento é calculado sem reler as paradas.
+    """
+    codes, labels = zip(*(_level_codes(df, level) for level in DRILL_LEVELS))
+    # Identificador único da combinação (códigos deslocados para que -1 vire 0)
+    sizes = [len(level_labels) + 1 for level_labels in labels]
+    cell = np.zeros(len(df), dtype=np.int64)
+    for level_codes, size in zip(codes, sizes):
+        cell = cell * size + (np.asarray(level_codes, dtype=np.int64) + 1)
+    inverse, cells = pd.factorize(cell)
+
+    durations = df['Duração'].to_numpy(dtype='timedelta64[ns]').view(np.int64).astype(np.float64)
+    valid = df['Duração'].notna().to_numpy()
+    duration = np.bincount(inverse[valid], weights=durations[valid], minlength=len(cells))
+    count = np.bincount(inverse, minlength=len(cells))
+
+    cell_codes = np.empty((len(cells), len(DRILL_LEVELS)), dtype=np.int64)
+    remaining = np.asarray(cells, dtype=np.int64)
+    for position in range(len(DRILL_LEVELS) - 1, -1, -1):
+        remaining, cell_codes[:, position] = np.divmod(remaining, sizes[position])
+    return ParetoCube(labels, cell_codes - 1, duration, count)
+
+def drill_down(cube, path=(), n=10):
+    """
+    Pareto do nível seguinte ao caminho escolhido no detalhamento.
+
+    Args:
+        cube: Cubo de build_pareto_cube
+        path: Valores escolhidos nos primeiros níveis de DRILL_LEVELS (ex.: uma área
+            e uma causa)
+        n: Número máximo de itens (None para todos)
+
+    Returns:
+        pd.DataFrame: Colunas 'Duração' e 'Paradas' indexadas pelos valores do nível
+            seguinte, em ordem decrescente de duração
+    """
+    depth = len(path)
+    if depth >= len(DRILL_LEVELS):
+        raise ValueError(f"Caminho maior que os níveis do detalhamento: {path!r}")
+
+    mask = np.ones(len(cube.count), dtype=bool)
+    for position, value in enumerate(path):
+        code = cube.labels[position].get_indexer([value])[0]
+        mask &= (cube.codes[:, position] == code) if code >= 0 else False
+    codes = cube.codes[mask, depth]
+    valid = codes >= 0
+    labels = cube.labels[depth]
+    duration = np.bincount(codes[valid], weights=cube.duration[mask][valid], minlength=len(labels))
+    count = np.bincount(codes[valid], weights=cube.count[mask][valid], minlength=len(labels)).astype(np.int64)
+
+    pareto = pd.DataFrame({
+        'Duração': pd.to_timedelta(duration.round().astype(np.int64)),
+        'Paradas': count,
+    }, index=labels.rename(DRILL_LEVELS[depth]))
+    pareto = pareto[count > 0].sort_values('Duração', ascending=False)
+    return pareto.head(n) if n else pareto
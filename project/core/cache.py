@@ -0,0 +1,426 @@
+import os
+import sys
+import time
+import pickle
+import hashlib
+import weakref
+import threading
+import functools
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+import numpy as np
+import pandas as pd
+
+# Memory budget shared by every cached layer (data, calculations, charts, exports)
+MAX_MEMORY_MB = float(os.environ.get('PAINEL_CACHE_MAX_MB', '512'))
+
+# Backend used by cached(): 'memory' (LRU in this process), 'disk' or 'none'
+BACKEND = os.environ.get('PAINEL_CACHE_BACKEND', 'memory')
+
+# Directory of the on-disk backend
+DISK_DIR = os.environ.get('PAINEL_CACHE_DIR', os.path.join('.cache', 'results'))
+
+# A single entry larger than this share of the budget is never cached
+MAX_ENTRY_FRACTION = 0.25
+
+
+def estimate_size(obj, _depth=0):
+    """Estimate the memory footprint of a cached value in bytes."""
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (str, bytes, bytearray)):
+        return sys.getsizeof(obj)
+    if _depth > 3:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _depth + 1) for item in obj)
+    if hasattr(obj, 'to_plotly_json'):
+        # Plotly figures: the bulk of the memory lives in the trace arrays
+        return estimate_size(obj.to_plotly_json(), _depth + 1)
+    return sys.getsizeof(obj)
+
+
+# DataFrames are hashed by content, which is O(rows). The same frame is usually
+# passed to many cached functions on a rerun, so the digest is memoized per object
+# and revalidated against its shape and columns (frames are never edited in place;
+# the memory backend hands each caller its own copy, see _detach).
+_frame_digests = {}
+_frame_digests_lock = threading.Lock()
+
+
+def _frame_digest(obj):
+    signature = (obj.shape, tuple(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name)
+    key = id(obj)
+    with _frame_digests_lock:
+        cached = _frame_digests.get(key)
+    if cached is not None and cached[0]() is obj and cached[1] == signature:
+        return cached[2]
+
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(signature).encode())
+    hasher.update(repr(list(obj.dtypes) if isinstance(obj, pd.DataFrame) else obj.dtype).encode())
+    try:
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    except TypeError:
+        # Unhashable cells (lists, dicts): fall back to pickling
+        hasher.update(pickle.dumps(obj))
+    digest = hasher.hexdigest()
+
+    def _forget(_ref, key=key):
+        with _frame_digests_lock:
+            _frame_digests.pop(key, None)
+
+    with _frame_digests_lock:
+        _frame_digests[key] = (weakref.ref(obj, _forget), signature, digest)
+    return digest
+
+
+def _hash_value(obj, hasher):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        hasher.update(b'F' + _frame_digest(obj).encode())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(b'A' + repr((obj.dtype, obj.shape)).encode() + obj.tobytes())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'L' + str(len(obj)).encode())
+        for item in obj:
+            _hash_value(item, hasher)
+    elif isinstance(obj, dict):
+        hasher.update(b'D' + str(len(obj)).encode())
+        for k in sorted(obj, key=repr):
+            _hash_value(k, hasher)
+            _hash_value(obj[k], hasher)
+    elif obj is None or isinstance(obj, (str, int, float, bool, date, datetime, timedelta,
+                                          pd.Timestamp, pd.Timedelta, np.generic)):
+        hasher.update(type(obj).__name__.encode() + repr(obj).encode())
+    else:
+        hasher.update(pickle.dumps(obj))
+
+
+def make_key(name, args, kwargs):
+    """Build the cache key for a call of the function `name`."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(name.encode())
+    _hash_value(args, hasher)
+    _hash_value(kwargs, hasher)
+    return hasher.hexdigest()
+
+
+# pandas 3 copies on write: a shallow copy is enough to keep a caller's in-place
+# edits away from the cached object
+SHALLOW_COPIES = int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+def _detach(value, _depth=0):
+    """Copy of the pandas objects of a cached value (containers are rebuilt, other values shared)."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not SHALLOW_COPIES)
+    if _depth > 3:
+        return value
+    if type(value) is dict:
+        return {k: _detach(v, _depth + 1) for k, v in value.items()}
+    if type(value) is list:
+        return [_detach(item, _depth + 1) for item in value]
+    if isinstance(value, tuple):
+        items = [_detach(item, _depth + 1) for item in value]
+        return type(value)(*items) if hasattr(value, '_fields') else tuple(items)
+    return value
+
+
+class NullBackend:
+    """Backend that never stores anything (batch jobs, debugging)."""
+
+    max_bytes = 0
+    used_mb = 0.0
+
+    def get(self, key, layer):
+        return False, None
+
+    def put(self, key, value, layer, ttl=None):
+        pass
+
+    def clear(self, layer=None):
+        pass
+
+    def set_budget(self, max_memory_mb):
+        pass
+
+    def stats(self):
+        return pd.DataFrame()
+
+
+class MemoryLRUBackend:
+    """
+    Process-wide cache with a memory budget and size-aware LRU eviction.
+
+    Every entry belongs to a layer (e.g. 'data', 'calculations', 'charts',
+    'exports'); the budget is enforced across all layers together and the least
+    recently used entries are evicted first until the new entry fits.
+
+    Values live in this process and are handed to every session, so their
+    DataFrames and Series are stored and returned as copies (_detach).
+    """
+
+    def __init__(self, max_memory_mb=MAX_MEMORY_MB):
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+        self._stats = {}
+
+    def _layer_stats(self, layer):
+        return self._stats.setdefault(layer, {'hits': 0, 'misses': 0, 'evictions': 0})
+
+    def get(self, key, layer):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires'] is not None and entry['expires'] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._layer_stats(layer)['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._layer_stats(layer)['hits'] += 1
+            value = entry['value']
+        return True, _detach(value)
+
+    def put(self, key, value, layer, ttl=None):
+        """Store a value, evicting least recently used entries if needed."""
+        size = estimate_size(value)
+        if size > self.max_bytes * MAX_ENTRY_FRACTION:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self._size + size > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._layer_stats(self._entries[oldest_key]['layer'])['evictions'] += 1
+                self._remove(oldest_key)
+            self._entries[key] = {
+                'value': _detach(value),
+                'size': size,
+                'layer': layer,
+                'expires': time.time() + ttl if ttl else None,
+            }
+            self._size += size
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry['size']
+
+    def clear(self, layer=None):
+        """Remove every entry, or only the entries of the given layer."""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if layer is None or e['layer'] == layer]:
+                self._remove(key)
+
+    def set_budget(self, max_memory_mb):
+        """Change the memory budget, evicting entries if the cache no longer fits."""
+        with self._lock:
+            self.max_bytes = int(max_memory_mb * 1024 * 1024)
+            while self._entries and self._size > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._layer_stats(self._entries[oldest_key]['layer'])['evictions'] += 1
+                self._remove(oldest_key)
+
+    def stats(self):
+        """Return per-layer statistics as a DataFrame."""
+        with self._lock:
+            rows = {}
+            for layer, counters in self._stats.items():
+                rows[layer] = {'entries': 0, 'size_mb': 0.0, **counters}
+            for entry in self._entries.values():
+                row = rows.setdefault(entry['layer'], {'entries': 0, 'size_mb': 0.0, 'hits': 0, 'misses': 0, 'evictions': 0})
+                row['entries'] += 1
+                row['size_mb'] += entry['size'] / (1024 * 1024)
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    @property
+    def used_mb(self):
+        return self._size / (1024 * 1024)
+
+
+class DiskBackend:
+    """
+    Cache stored as pickle files, shared by every process using the same directory.
+
+    The budget applies to the total size of the files; the least recently
+    used files (by modification time, refreshed on every hit) are removed first.
+    """
+
+    def __init__(self, directory=DISK_DIR, max_memory_mb=MAX_MEMORY_MB):
+        self.directory = directory
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._stats = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _layer_stats(self, layer):
+        return self._stats.setdefault(layer, {'hits': 0, 'misses': 0, 'evictions': 0})
+
+    def _path(self, key, layer):
+        return os.path.join(self.directory, f"{layer}-{key}.pkl")
+
+    def _files(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name.split('-', 1)[0], path))
+        return sorted(entries)
+
+    def get(self, key, layer):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        path = self._path(key, layer)
+        try:
+            with open(path, 'rb') as cache_file:
+                expires, value = pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self._lock:
+                self._layer_stats(layer)['misses'] += 1
+            return False, None
+        with self._lock:
+            if expires is not None and expires < time.time():
+                self._layer_stats(layer)['misses'] += 1
+                self._unlink(path)
+                return False, None
+            self._layer_stats(layer)['hits'] += 1
+        try:
+            os.utime(path)
+        except OSError:
+            # Evicted by another process since the read: the value is still valid
+            pass
+        return True, value
+
+    def put(self, key, value, layer, ttl=None):
+        """Store a value, removing least recently used files if needed."""
+        try:
+            payload = pickle.dumps((time.time() + ttl if ttl else None, value), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        if len(payload) > self.max_bytes * MAX_ENTRY_FRACTION:
+            return
+        path = self._path(key, layer)
+        # Every process (and thread) writes its own temporary file
+        temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with self._lock:
+            self._evict(self.max_bytes - len(payload))
+            try:
+                with open(temporary, 'wb') as cache_file:
+                    cache_file.write(payload)
+                os.replace(temporary, path)
+            except OSError:
+                # Directory shared with other processes (or full): the value is just not stored
+                self._unlink(temporary)
+
+    def _unlink(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _evict(self, target_bytes):
+        files = self._files()
+        total = sum(size for _, size, _, _ in files)
+        for _, size, layer, path in files:
+            if total <= target_bytes:
+                break
+            self._layer_stats(layer)['evictions'] += 1
+            self._unlink(path)
+            total -= size
+
+    def clear(self, layer=None):
+        """Remove every entry, or only the entries of the given layer."""
+        with self._lock:
+            for _, _, file_layer, path in self._files():
+                if layer is None or file_layer == layer:
+                    self._unlink(path)
+
+    def set_budget(self, max_memory_mb):
+        """Change the size budget, removing files if the cache no longer fits."""
+        with self._lock:
+            self.max_bytes = int(max_memory_mb * 1024 * 1024)
+            self._evict(self.max_bytes)
+
+    def stats(self):
+        """Return per-layer statistics as a DataFrame."""
+        with self._lock:
+            rows = {layer: {'entries': 0, 'size_mb': 0.0, **counters} for layer, counters in self._stats.items()}
+            for _, size, layer, _ in self._files():
+                row = rows.setdefault(layer, {'entries': 0, 'size_mb': 0.0, 'hits': 0, 'misses': 0, 'evictions': 0})
+                row['entries'] += 1
+                row['size_mb'] += size / (1024 * 1024)
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    @property
+    def used_mb(self):
+        return sum(size for _, size, _, _ in self._files()) / (1024 * 1024)
+
+
+BACKENDS = {
+    'memory': MemoryLRUBackend,
+    'disk': DiskBackend,
+    'none': NullBackend,
+}
+
+_backend = None
+
+
+def get_backend():
+    """Return the active cache backend, creating it from PAINEL_CACHE_BACKEND on first use."""
+    global _backend
+    if _backend is None:
+        _backend = BACKENDS[BACKEND]()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the active cache backend (an instance or one of 'memory', 'disk', 'none')."""
+    global _backend
+    _backend = BACKENDS[backend]() if isinstance(backend, str) else backend
+
+
+def cached(layer='default', ttl=None):
+    """
+    Decorator that memoizes a function in the active cache backend.
+
+    Returned DataFrames and Series are the caller's own copies (the memory
+    backend copies them, the disk backend unpickles them), so editing them in
+    place never changes the results of other sessions. Other values, such as
+    arrays and figures, are shared and must be treated as read-only.
+
+    Args:
+        layer: Name of the cache layer, used for statistics and selective clearing
+        ttl: Optional time to live of the entries, in seconds
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = get_backend()
+            if isinstance(backend, NullBackend):
+                return func(*args, **kwargs)
+            key = make_key(name, args, kwargs)
+            hit, value = backend.get(key, layer)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            backend.put(key, value, layer, ttl)
+            return value
+
+        wrapper.clear = lambda: get_backend().clear(layer)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,83 @@
+"""
+Localized month and weekday labels.
+
+Labels come from fixed lookup tables indexed by the integer codes pandas already
+computes (month 1-12, weekday Monday=0), never from strftime('%B') or
+day_name(), so they do not depend on the server locale. Column labels are
+categoricals over the full, ordered list of names: the strings exist once per
+language and each row only stores its code, so labelling costs O(distinct
+values) and sorting follows the calendar instead of the alphabet.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_LANGUAGE = 'pt'
+
+MONTH_NAMES = {
+    'pt': ('Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+           'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'),
+    'en': ('January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December'),
+}
+
+# Indexed by the pandas weekday code (Monday=0)
+WEEKDAY_NAMES = {
+    'pt': ('Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo'),
+    'en': ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'),
+}
+
+
+def _names(table, language):
+    return table.get(language, table[DEFAULT_LANGUAGE])
+
+
+def _codes(values, offset=0):
+    """Integer codes of values (Series or array, possibly with missing values), -1 where missing."""
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    return values.fillna(-1 + offset).to_numpy(dtype=np.int64) - offset
+
+
+def _categorical(codes, names, like):
+    labels = pd.Categorical.from_codes(codes, categories=pd.Index(names), ordered=True)
+    if isinstance(like, pd.Series):
+        return pd.Series(labels, index=like.index, name=like.name)
+    return labels
+
+
+def month_labels(months, language=DEFAULT_LANGUAGE):
+    """Month names of month numbers (1-12), as an ordered categorical."""
+    return _categorical(_codes(months, offset=1), _names(MONTH_NAMES, language), months)
+
+
+def weekday_labels(weekdays, language=DEFAULT_LANGUAGE):
+    """Weekday names of weekday codes (Monday=0), as an ordered categorical."""
+    return _categorical(_codes(weekdays), _names(WEEKDAY_NAMES, language), weekdays)
+
+
+def year_month_keys(dates):
+    """
+    'YYYY-MM' key of each date (missing for NaT).
+
+    Each distinct month is formatted once and broadcast through the factorized
+    codes, instead of running strftime on every row.
+    """
+    ordinals = dates.dt.year * 12 + dates.dt.month - 1
+    codes, uniques = pd.factorize(ordinals)
+    keys = np.array(
+        [f"{int(ordinal) // 12:04d}-{int(ordinal) % 12 + 1:02d}" for ordinal in uniques] + [np.nan],
+        dtype=object
+    )
+    return pd.Series(keys[codes], index=dates.index)
+
+
+def month_name(year_month, language=DEFAULT_LANGUAGE):
+    """
+    Readable name of a 'YYYY-MM' key, e.g. 'Março 2024'.
+
+    Raises:
+        ValueError: If year_month is not a 'YYYY-MM' key
+    """
+    year, separator, month = str(year_month).partition('-')
+    if not (separator and year.isdigit() and month.isdigit() and 1 <= int(month) <= 12):
+        raise ValueError(f"Not a 'YYYY-MM' key: {year_month!r}")
+    return f"{_names(MONTH_NAMES, language)[int(month) - 1]} {int(year)}"
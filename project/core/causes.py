@@ -0,0 +1,117 @@
+"""
+Normalization and interning of stoppage causes (Parada).
+
+Causes are free text typed by operators, so the same cause arrives as
+'Troca de formato', 'troca de  formato' or 'Troca de Formato ', which splits
+Pareto bars and frequency rankings. Each distinct text is reduced once to a
+comparison key (no accents, case or repeated whitespace) and every key gets a
+single label: the canonical name of the alias table when it has one, otherwise
+the variant of the key with most rows (ties go to the first in sort order), so
+the label does not depend on row order. Labels are stored as a categorical, so
+each row only keeps an integer code.
+
+The alias table is a JSON object mapping variants to canonical names, read from
+PAINEL_CAUSE_ALIASES, e.g. {"Setup": "Troca de formato", "TF": "Troca de formato"}.
+"""
+import os
+import json
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+def cause_key(text):
+    """Comparison key of a cause: without accents, casefolded, with single spaces."""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def load_aliases(path):
+    """
+    Read an alias table (JSON object variant -> canonical name).
+
+    Raises:
+        ValueError: If the file is not a JSON object of strings
+    """
+    if not path:
+        return {}
+    with open(path, encoding='utf-8') as file:
+        aliases = json.load(file)
+    if not isinstance(aliases, dict) or not all(isinstance(v, str) for item in aliases.items() for v in item):
+        raise ValueError(f"Cause alias table must be a JSON object of strings: {path}")
+    return aliases
+
+
+# Alias table applied by process_data
+ALIASES = load_aliases(os.environ.get('PAINEL_CAUSE_ALIASES'))
+
+
+def _alias_labels(aliases):
+    """Key -> canonical name, including the keys of the canonical names themselves."""
+    labels = {cause_key(canonical): canonical for canonical in aliases.values()}
+    labels.update((cause_key(variant), canonical) for variant, canonical in aliases.items())
+    return labels
+
+
+def _as_categorical(values):
+    if not isinstance(values, (list, tuple)):
+        return values
+    # Several columns: their categories are unioned without materializing the strings
+    parts = []
+    for part in values:
+        part = part.array if isinstance(part.dtype, pd.CategoricalDtype) else pd.Categorical(part)
+        parts.append(part.rename_categories(part.categories.astype(object)))
+    return pd.api.types.union_categoricals(parts, ignore_order=True)
+
+
+def normalize_causes(values, aliases=None):
+    """
+    Canonical cause of each value, as a categorical with sorted categories.
+
+    Args:
+        values: Series of cause texts, or a list of them (labelled as if concatenated)
+        aliases: Variant -> canonical name table (default ALIASES)
+
+    Returns:
+        pd.Categorical: One code per row; missing or blank causes are missing
+    """
+    aliases = ALIASES if aliases is None else aliases
+    alias_labels = _alias_labels(aliases)
+    codes, uniques = pd.factorize(_as_categorical(values))
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    # Rows of each variant (texts differing only in outer or repeated spaces are one variant)
+    keys = [cause_key(value) for value in uniques]
+    variant_rows = {}
+    for key, value, count in zip(keys, uniques, counts):
+        if key:
+            variant = ' '.join(str(value).split())
+            variant_rows.setdefault(key, {})
+            variant_rows[key][variant] = variant_rows[key].get(variant, 0) + count
+
+    labels_by_key = {
+        key: alias_labels.get(key) or min(variants, key=lambda variant: (-variants[variant], variant))
+        for key, variants in variant_rows.items()
+    }
+    labels = [labels_by_key.get(key) for key in keys]
+
+    label_codes, categories = pd.factorize(pd.Series(labels, dtype=object), sort=True)
+    codes = np.where(codes >= 0, np.append(label_codes, -1)[codes], -1)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories, dtype=object))
+
+
+def concat_stoppages(frames):
+    """
+    Concatenate processed frames, interning Parada over all of them.
+
+    pd.concat turns categoricals with different categories into plain strings,
+    and each frame names its causes after its own most frequent variants; here
+    the causes of the result are labelled once, over the rows of all frames.
+    """
+    combined = pd.concat(frames, ignore_index=True)
+    columns = [frame['Parada'] for frame in frames if 'Parada' in frame.columns]
+    if len(columns) == len(frames) and frames:
+        combined['Parada'] = normalize_causes(columns)
+    return combined
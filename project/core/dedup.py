@@ -0,0 +1,102 @@
+"""
+Deduplication of repeated stoppage records.
+
+Exports of overlapping date ranges repeat the same stoppages, which would be
+counted twice in every KPI. Each stoppage is identified by a 64-bit hash of its
+normalized (Máquina, Inicio, Fim, Parada) key; a DedupIndex keeps the sorted
+keys already loaded, so an incremental load only hashes its new rows and looks
+them up with a binary search instead of re-sorting the whole history.
+"""
+import numpy as np
+import pandas as pd
+
+from core.causes import cause_key
+
+# Timestamps are compared at this resolution (exports differ in sub-second noise)
+TIMESTAMP_RESOLUTION = 's'
+
+
+def _normalized_text(values):
+    """Text compared as core.causes.cause_key, as a categorical; each distinct value is normalized once."""
+    codes, uniques = pd.factorize(values)
+    normal_codes, normal_uniques = pd.factorize(pd.Series([cause_key(value) for value in uniques], dtype=object))
+    return pd.Categorical.from_codes(np.where(codes >= 0, normal_codes[codes], -1), categories=normal_uniques)
+
+
+def stoppage_keys(df):
+    """
+    Hash of the normalized (Máquina, Inicio, Fim, Parada) key of every row.
+
+    Machine and cause are compared without accents, case and repeated whitespace,
+    start and end at whole seconds. Equal keys hash equally in any frame, so the
+    keys of different loads can be compared.
+
+    Returns:
+        np.ndarray: uint64 key of each row, in row order
+    """
+    key = pd.DataFrame({
+        'Máquina': _normalized_text(df['Máquina']),
+        'Inicio': df['Inicio'].dt.floor(TIMESTAMP_RESOLUTION),
+        'Fim': df['Fim'].dt.floor(TIMESTAMP_RESOLUTION),
+        'Parada': _normalized_text(df['Parada']) if 'Parada' in df.columns else pd.Categorical([None] * len(df)),
+    })
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+class DedupIndex:
+    """Sorted set of the stoppage keys loaded so far."""
+
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def contains(self, keys):
+        """Boolean mask of the keys already in the index (binary search)."""
+        if not len(self._keys):
+            return np.zeros(len(keys), dtype=bool)
+        positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        return self._keys[positions] == keys
+
+    def admit(self, keys):
+        """
+        Mask of the rows to keep: keys not in the index, first occurrence only.
+
+        The admitted keys are added to the index; the existing keys are already
+        sorted, so the merge costs a linear pass plus sorting the new keys.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        new = ~pd.Index(keys).duplicated(keep='first') & ~self.contains(keys)
+        if new.any():
+            self._keys = np.sort(np.concatenate([self._keys, np.sort(keys[new])]), kind='stable')
+        return new
+
+
+def drop_duplicate_stoppages(df, index=None):
+    """
+    Drop the rows whose stoppage key was already seen (in index or earlier in df).
+
+    Args:
+        df: DataFrame processed by process_data
+        index: DedupIndex of the rows loaded before (a new one when None); it is
+            updated with the keys of the rows kept
+
+    Returns:
+        tuple: (DataFrame without the duplicates, DedupIndex)
+    """
+    index = DedupIndex() if index is None else index
+    if df.empty:
+        return df, index
+    return df[index.admit(stoppage_keys(df))], index
+
+
+def deduplicate_stoppages(df):
+    """
+    Drop the repeated stoppages of a single load (first occurrence kept).
+
+    Returns:
+        tuple: (DataFrame without the duplicates, number of rows dropped)
+    """
+    deduplicated, _ = drop_duplicate_stoppages(df)
+    return deduplicated, len(df) - len(deduplicated)
@@ -0,0 +1,97 @@
+"""
+Server-side downsampling of long time series for charts.
+
+A chart a few hundred pixels wide cannot show more than a couple of points per
+pixel, so daily or hourly series over several years are reduced to about that
+many points before they are sent to the browser:
+  - 'lttb' (Largest-Triangle-Three-Buckets) keeps, in each bucket, the point that
+    best preserves the visual shape of the line;
+  - 'minmax' keeps the minimum and maximum of each bucket, so no spike is lost.
+Both return positions into the original series, so x and any other column can
+be taken with the same indices.
+"""
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64) or np.issubdtype(values.dtype, np.timedelta64):
+        return values.astype('int64').astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Positions of the n_out points selected by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the points in between are split
+    into n_out - 2 buckets and, in each one, the point forming the largest
+    triangle with the previously selected point and the mean of the next bucket
+    is kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x, y = _as_float(x), _as_float(y)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    # Mean of every bucket, plus the last point as the "next bucket" of the last one
+    sizes = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / sizes, x[-1])
+    mean_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """
+    Positions of the minimum and maximum of each of n_out // 2 buckets.
+
+    The first and last points are always kept, so at most n_out + 2 points are
+    returned, in their original order.
+    """
+    n = len(y)
+    buckets = max(1, n_out // 2)
+    if 2 * buckets >= n:
+        return np.arange(n)
+
+    y = _as_float(y)
+    bucket = np.arange(n) * buckets // n
+    # Sorted by bucket, then by value: the first row of a bucket is its minimum, the last its maximum
+    order = np.lexsort((y, bucket))
+    stops = np.flatnonzero(np.r_[bucket[order][1:] != bucket[order][:-1], True])
+    starts = np.r_[0, stops[:-1] + 1]
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[stops]]))
+
+
+def downsample_indices(x, y, max_points, method='lttb'):
+    """
+    Positions of the points to plot so that at most about max_points remain.
+
+    Args:
+        x: Sorted x values (numbers or datetimes)
+        y: y values
+        max_points: Target number of points (None keeps every point)
+        method: 'lttb' or 'minmax'
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method!r} (expected one of {METHODS})")
+    if max_points is None or len(y) <= max_points:
+        return np.arange(len(y))
+    if method == 'minmax':
+        return minmax_indices(y, max_points)
+    return lttb_indices(x, y, max_points)
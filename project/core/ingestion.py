@@ -0,0 +1,249 @@
+"""
+Automatic ingestion of stoppage exports dropped into a watched folder.
+
+A background thread polls PAINEL_INGEST_DIR; new or changed workbooks are read
+and run through process_data one file at a time (unchanged files keep their
+processed frame), and the combined dataset is published as a new version along
+with its per-partition aggregates and duration sketches, which appended rows
+update incrementally. Stoppages repeated across overlapping exports are dropped
+(core.dedup): the service keeps the keys of the dataset between versions, so
+appended rows are only checked against them.
+Cached results are keyed by the content of their inputs, so a new version never
+reuses results of the previous one; stale entries age out of the LRU.
+"""
+import os
+import time
+import threading
+from collections import deque
+from datetime import datetime
+import pandas as pd
+
+from core.processing import process_data
+from core.aggregates import build_partitions, update_partitions
+from core.sketches import build_duration_sketches, update_sketches
+from core.dedup import DedupIndex, drop_duplicate_stoppages
+from core.causes import concat_stoppages
+
+# Folder watched for new exports (unset disables the ingestion service)
+INGEST_DIR = os.environ.get('PAINEL_INGEST_DIR')
+
+# Seconds between two scans of the folder
+POLL_INTERVAL = float(os.environ.get('PAINEL_INGEST_INTERVAL', '60'))
+
+# Files modified more recently than this (s) may still be being copied
+SETTLE_SECONDS = 2
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xls')
+
+# Entries kept in the change log
+MAX_LOG_ENTRIES = 100
+
+
+class IngestionService:
+    """
+    Watches a folder and keeps the processed, combined dataset of its workbooks.
+
+    Every scan that adds, updates or removes a workbook publishes a new dataset
+    version; readers take consistent (version, dataset) snapshots.
+    """
+
+    def __init__(self, directory, interval=POLL_INTERVAL, reader=pd.read_excel):
+        self.directory = directory
+        self.interval = interval
+        self._reader = reader
+        self._files = {}
+        self._failed = {}
+        self._unreachable = False
+        self._dataset = None
+        self._version = 0
+        self._log = deque(maxlen=MAX_LOG_ENTRIES)
+        self._partitions = None
+        self._sketches = None
+        self._dedup = DedupIndex()
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        """Return (version, dataset); the dataset is None until a workbook is ingested."""
+        with self._lock:
+            return self._version, self._dataset
+
+    def changes(self):
+        """Return the change log, most recent entry first."""
+        with self._lock:
+            return list(reversed(self._log))
+
+    def aggregates(self):
+        """
+        Return (version, dataset, partitions, sketches): the dataset with its
+        per-partition aggregates (core.aggregates) and duration sketches (core.sketches).
+        """
+        with self._lock:
+            return self._version, self._dataset, self._partitions, self._sketches
+
+    @staticmethod
+    def _appended_rows(old, new):
+        """Rows added at the end of a rewritten workbook, or None if earlier rows changed."""
+        if len(new) < len(old) or not new.iloc[:len(old)].reset_index(drop=True).equals(old.reset_index(drop=True)):
+            return None
+        return new.iloc[len(old):]
+
+    def _listing(self):
+        """Map each settled workbook of the folder to its (mtime, size) signature."""
+        listing = {}
+        now = time.time()
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return None
+        for entry in entries:
+            if not entry.is_file() or not entry.name.lower().endswith(WORKBOOK_EXTENSIONS):
+                continue
+            # Office lock files (~$name.xlsx) are not workbooks
+            if entry.name.startswith('~$'):
+                continue
+            stat = entry.stat()
+            if now - stat.st_mtime >= SETTLE_SECONDS:
+                listing[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return listing
+
+    def _record(self, **entry):
+        self._log.append({'time': datetime.now(), **entry})
+
+    def scan(self):
+        """
+        Ingest the new or changed workbooks of the folder once.
+
+        Returns:
+            bool: True when a new dataset version was published
+        """
+        with self._scan_lock:
+            listing = self._listing()
+            if listing is None:
+                if not self._unreachable:
+                    with self._lock:
+                        self._record(event='erro', file=self.directory, rows=0, detail='pasta inacessível')
+                self._unreachable = True
+                return False
+            self._unreachable = False
+
+            known = {path: signature for path, (signature, _) in self._files.items()}
+            changed = [
+                path for path, signature in sorted(listing.items())
+                if known.get(path) != signature and self._failed.get(path) != signature
+            ]
+            removed = [path for path in known if path not in listing]
+            self._failed = {path: signature for path, signature in self._failed.items() if path in listing}
+            if not changed and not removed:
+                return False
+
+            parsed, failed = {}, []
+            for path in changed:
+                try:
+                    parsed[path] = (listing[path], process_data(self._reader(path)))
+                except Exception as error:
+                    # Keeps the previous content of the file (if any); retried once the file changes again
+                    self._failed[path] = listing[path]
+                    failed.append((path, str(error)))
+
+            with self._lock:
+                for path, detail in failed:
+                    self._record(event='erro', file=os.path.basename(path), rows=0, detail=detail)
+                if not parsed and not removed:
+                    return False
+
+                appended = [] if not removed else None
+                for path, (signature, frame) in parsed.items():
+                    if path in self._files:
+                        rows = self._appended_rows(self._files[path][1], frame)
+                        self._record(event='atualizado', file=os.path.basename(path), rows=len(frame), detail='')
+                    else:
+                        rows = frame
+                        self._record(event='novo', file=os.path.basename(path), rows=len(frame), detail='')
+                    if appended is not None:
+                        appended = None if rows is None else appended + [rows]
+                    self._files[path] = (signature, frame)
+                for path in removed:
+                    self._record(event='removido', file=os.path.basename(path), rows=len(self._files[path][1]),
+                                 detail='')
+                    del self._files[path]
+
+                # Rows only appended: checked against the keys already loaded, and
+                # just the touched partitions are updated
+                if appended is not None and self._dataset is not None:
+                    if appended:
+                        new_rows = pd.concat(appended, ignore_index=True)
+                        kept, self._dedup = drop_duplicate_stoppages(new_rows, self._dedup)
+                        previous = self._dataset['Parada'].cat.categories
+                        self._dataset = concat_stoppages([self._dataset, kept])
+                        if previous.isin(self._dataset['Parada'].cat.categories).all():
+                            kept = self._dataset.iloc[len(self._dataset) - len(kept):]
+                            self._partitions = update_partitions(self._partitions, kept)
+                            self._sketches = update_sketches(self._sketches, kept)
+                        else:
+                            # The new rows changed the most frequent variant of a cause,
+                            # which relabels existing rows: the partitions are rebuilt
+                            self._partitions = build_partitions(self._dataset)
+                            self._sketches = build_duration_sketches(self._dataset)
+                        duplicates = len(new_rows) - len(kept)
+                    else:
+                        duplicates = 0
+                elif self._files:
+                    combined = concat_stoppages([self._files[path][1] for path in sorted(self._files)])
+                    kept, self._dedup = drop_duplicate_stoppages(combined)
+                    self._dataset = kept.reset_index(drop=True)
+                    self._partitions = build_partitions(self._dataset)
+                    self._sketches = build_duration_sketches(self._dataset)
+                    duplicates = len(combined) - len(kept)
+                else:
+                    self._dataset = self._partitions = self._sketches = None
+                    self._dedup = DedupIndex()
+                    duplicates = 0
+                if duplicates:
+                    self._record(event='duplicadas', file='', rows=duplicates, detail='paradas repetidas ignoradas')
+                self._version += 1
+                return True
+
+    def _run(self):
+        while True:
+            try:
+                self.scan()
+            except Exception as error:
+                with self._lock:
+                    self._record(event='erro', file=self.directory, rows=0, detail=str(error))
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        """Start the polling thread (the first scan runs immediately)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='painel-ingestion', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    """Return the process-wide ingestion service, started on first use, or None when PAINEL_INGEST_DIR is unset."""
+    global _service
+    if not INGEST_DIR:
+        return None
+    with _service_lock:
+        if _service is None:
+            _service = IngestionService(INGEST_DIR)
+            _service.start()
+        return _service
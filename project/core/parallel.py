@@ -0,0 +1,237 @@
+"""
+Parallel KPI computation over partitions of the stoppage data.
+
+The dataset is partitioned by one or more key columns (machine, plant, month...)
+and a KPI bundle is computed for each partition in a process pool. The parent
+writes the needed columns once, as an Arrow IPC stream, into a shared-memory
+segment; workers map that segment, slice their partitions without copying and
+send back only the small KPI dicts, so no DataFrame is ever pickled.
+"""
+import os
+import heapq
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from core.calculations import calculate_kpi_bundle, calculate_scheduled_time
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = None
+
+# Columns read by calculate_kpi_bundle; partition keys are added on top
+KPI_COLUMNS = ['Máquina', 'Inicio', 'Duração', 'Área Responsável']
+
+CPU_COUNT = os.cpu_count() or 1
+
+# Default pool size (0 or 1 disables the process pool)
+DEFAULT_WORKERS = int(os.environ.get('PAINEL_WORKERS', str(CPU_COUNT)))
+
+# Smallest input (rows) for which the pool beats the serial loop, as measured by
+# benchmarks/parallel.py on the host; unset disables the pool. On the reference
+# host (1 CPU, 2 workers) the pool was slower at every size (serial vs pool:
+# 300k rows by Máquina 0.08 s vs 0.11 s, by Máquina x Ano-Mês 0.31 s vs 0.50 s;
+# 2M rows 0.41 s vs 0.63 s and 0.89 s vs 1.19 s), so there is no default threshold.
+MIN_PARALLEL_ROWS = int(os.environ['PAINEL_PARALLEL_MIN_ROWS']) if os.environ.get('PAINEL_PARALLEL_MIN_ROWS') else None
+
+# Partitions are grouped into about this many tasks per worker, balanced by size
+TASKS_PER_WORKER = 4
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    """Return the shared process pool, (re)created with the requested size."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # spawn: forking a process that runs Streamlit's threads is not safe
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown():
+    """Stop the worker processes of the shared pool, if any."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor, _executor_workers = None, 0
+
+
+atexit.register(shutdown)
+
+
+def _partition_bounds(df, by):
+    """
+    Order the rows by partition.
+
+    Returns:
+        tuple: (row order, list of (key, start, stop)) where rows start:stop of the
+            reordered frame make up the partition with the given key
+    """
+    codes = df.groupby(by, sort=True, dropna=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes)
+    stops = np.cumsum(counts)
+    starts = stops - counts
+
+    first_rows = df[by].iloc[order[starts]]
+    keys = list(first_rows.itertuples(index=False, name=None)) if isinstance(by, list) else first_rows.tolist()
+    return order, list(zip(keys, starts.tolist(), stops.tolist()))
+
+
+def _balanced_tasks(bounds, n_tasks):
+    """Split the partitions into n_tasks lists of similar row counts (largest first)."""
+    heap = [(0, index, []) for index in range(n_tasks)]
+    for bound in sorted(bounds, key=lambda bound: bound[2] - bound[1], reverse=True):
+        rows, index, task = heapq.heappop(heap)
+        task.append(bound)
+        heapq.heappush(heap, (rows + bound[2] - bound[1], index, task))
+    return [task for _, _, task in heap if task]
+
+
+def _partition_kpis(part, key, by, scheduled_time):
+    """KPI bundle of one partition; without a fixed scheduled time it comes from the partition's month or span."""
+    if scheduled_time is None:
+        month = None
+        if isinstance(by, list) and 'Ano-Mês' in by:
+            month = key[by.index('Ano-Mês')]
+        elif by == 'Ano-Mês':
+            month = key
+        scheduled_time, _ = calculate_scheduled_time(part, month)
+    return calculate_kpi_bundle(part, scheduled_time)
+
+
+def _attach(name):
+    """Map an existing shared-memory segment owned by the parent process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers share the parent's resource tracker, where
+        # the segment is already registered (and unregistered again on unlink)
+        return shared_memory.SharedMemory(name=name)
+
+
+def _compute_from_buffer(buffer, nbytes, by, tasks, scheduled_time):
+    table = pa.ipc.open_stream(pa.py_buffer(buffer).slice(0, nbytes)).read_all()
+    return [
+        (key, _partition_kpis(table.slice(start, stop - start).to_pandas(), key, by, scheduled_time))
+        for key, start, stop in tasks
+    ]
+
+
+def _compute_task(segment_name, nbytes, by, tasks, scheduled_time):
+    """Worker entry point: compute the KPI bundles of a list of partitions."""
+    segment = _attach(segment_name)
+    try:
+        return _compute_from_buffer(segment.buf, nbytes, by, tasks, scheduled_time)
+    finally:
+        segment.close()
+
+
+def _write_stream(sink, table):
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _to_shared_memory(df):
+    """Write df as an Arrow IPC stream straight into a new shared-memory segment."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    mock = pa.MockOutputStream()
+    _write_stream(mock, table)
+    nbytes = mock.size()
+
+    segment = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    try:
+        buffer = pa.py_buffer(segment.buf)
+        _write_stream(pa.FixedSizeBufferWriter(buffer), table)
+        del buffer
+    except BaseException:
+        segment.close()
+        segment.unlink()
+        raise
+    return segment, nbytes
+
+
+def _merge(results, by):
+    keys = [key for key, _ in results]
+    index = pd.MultiIndex.from_tuples(keys, names=by) if isinstance(by, list) else pd.Index(keys, name=by)
+    return pd.DataFrame([bundle for _, bundle in results], index=index).sort_index()
+
+
+def _compute_serial(df, by, order, bounds, scheduled_time):
+    """KPI bundles of every partition, computed in the calling process."""
+    ordered = df.take(order)
+    return [
+        (key, _partition_kpis(ordered.iloc[start:stop], key, by, scheduled_time))
+        for key, start, stop in bounds
+    ]
+
+
+def _compute_pooled(df, by, order, bounds, scheduled_time, workers):
+    """KPI bundles of every partition, computed by the process pool from shared memory."""
+    segment, nbytes = _to_shared_memory(df.take(order))
+    try:
+        executor = _get_executor(workers)
+        futures = [
+            executor.submit(_compute_task, segment.name, nbytes, by, task, scheduled_time)
+            for task in _balanced_tasks(bounds, workers * TASKS_PER_WORKER)
+        ]
+        return [result for future in futures for result in future.result()]
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+def use_pool(rows, workers, min_rows=None):
+    """
+    Whether an input of this many rows goes to the process pool.
+
+    Only with pyarrow, more than one CPU and worker, and at least min_rows rows
+    (default MIN_PARALLEL_ROWS; None never uses the pool).
+    """
+    min_rows = MIN_PARALLEL_ROWS if min_rows is None else min_rows
+    return pa is not None and CPU_COUNT > 1 and workers > 1 and min_rows is not None and rows >= min_rows
+
+
+def compute_kpis_by_partition(df, scheduled_time=None, by='Máquina', workers=None):
+    """
+    Compute the KPI bundle of every partition of df.
+
+    Args:
+        df: DataFrame processed by process_data
+        scheduled_time: Scheduled time of each partition (timedelta); when None it
+            is derived per partition from its 'Ano-Mês' key or its date span
+        by: Partition column or list of columns (e.g. 'Máquina', a plant column,
+            ['Máquina', 'Ano-Mês'])
+        workers: Process pool size (default PAINEL_WORKERS); the pool is only used
+            when use_pool allows it, otherwise everything runs in the calling process
+
+    Returns:
+        pd.DataFrame: One row of KPIs per partition, indexed by the partition key
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    keys = by if isinstance(by, list) else [by]
+    columns = list(dict.fromkeys(KPI_COLUMNS + keys))
+    order, bounds = _partition_bounds(df, by)
+    workers = min(DEFAULT_WORKERS if workers is None else workers, len(bounds))
+
+    if use_pool(len(df), workers):
+        results = _compute_pooled(df[columns], by, order, bounds, scheduled_time, workers)
+    else:
+        results = _compute_serial(df[columns], by, order, bounds, scheduled_time)
+    return _merge(results, by)
@@ -0,0 +1,110 @@
+import pandas as pd
+import numpy as np
+
+from core.calendar_labels import month_labels, weekday_labels, year_month_keys
+from core.causes import normalize_causes
+
+def process_data(df):
+    """Process and clean the DataFrame data."""
+    # Create a copy to avoid SettingWithCopyWarning
+    df_processed = df.copy()
+    
+    # Machine mapping with treatment for unknown codes
+    machine_mapping = {
+        78: "PET",
+        79: "TETRA 1000",
+        80: "TETRA 200",
+        89: "SIG 1000",
+        91: "SIG 200"
+    }
+    
+    if 'Máquina' in df_processed.columns:
+        # Preserve the original code if not in the mapping
+        codes = df_processed['Máquina']
+        df_processed['Máquina'] = codes.map(machine_mapping).fillna('Machine ' + codes.astype(str))
+    
+    # Convert time columns to datetime format
+    for col in ['Inicio', 'Fim']:
+        if col in df_processed.columns:
+            df_processed[col] = pd.to_datetime(df_processed[col], errors='coerce')
+    
+    # Process the duration column
+    if 'Duração' in df_processed.columns:
+        # Try to convert the Duration column to timedelta
+        try:
+            df_processed['Duração'] = pd.to_timedelta(df_processed['Duração'])
+        except:
+            # If it fails, try to extract hours, minutes, and seconds and create a timedelta
+            if isinstance(df_processed['Duração'].iloc[0], str):
+                def parse_duration(duration_str):
+                    try:
+                        parts = duration_str.split(':')
+                        if len(parts) == 3:
+                            hours, minutes, seconds = map(int, parts)
+                            return pd.Timedelta(hours=hours, minutes=minutes, seconds=seconds)
+                        else:
+                            return pd.NaT
+                    except:
+                        return pd.NaT
+                
+                df_processed['Duração'] = df_processed['Duração'].apply(parse_duration)
+    
+    # Canonical causes, stored as categorical codes (see core.causes)
+    if 'Parada' in df_processed.columns:
+        df_processed['Parada'] = normalize_causes(df_processed['Parada'])
+    
+    # Add year, month, and year-month columns for easier filtering
+    df_processed['Ano'] = df_processed['Inicio'].dt.year
+    df_processed['Mês'] = df_processed['Inicio'].dt.month
+    # Labels come from lookup tables (independent of the server locale)
+    df_processed['Mês_Nome'] = month_labels(df_processed['Mês'], 'en')
+    df_processed['Ano-Mês'] = year_month_keys(df_processed['Inicio'])
+    
+    # Add week number and day of week for more detailed analysis
+    df_processed['Semana'] = df_processed['Inicio'].dt.isocalendar().week
+    df_processed['Dia_Semana'] = df_processed['Inicio'].dt.dayofweek
+    df_processed['Dia_Semana_Nome'] = weekday_labels(df_processed['Dia_Semana'], 'en')
+    
+    # Add hour of day for time-based analysis
+    df_processed['Hora'] = df_processed['Inicio'].dt.hour
+    
+    # Remove records with missing values in essential columns
+    df_processed = df_processed.dropna(subset=['Máquina', 'Inicio', 'Fim', 'Duração'])
+    
+    return df_processed
+
+def format_duration(duration):
+    """Format a duration (timedelta) for display."""
+    if pd.isna(duration):
+        return "00:00:00"
+    
+    total_seconds = int(duration.total_seconds())
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+def filter_data_by_date_range(df, start_date, end_date):
+    """Filter data by date range."""
+    if start_date and end_date:
+        return df[(df['Inicio'] >= start_date) & (df['Inicio'] <= end_date)]
+    return df
+
+def filter_data(df, machine, month=None, start_date=None, end_date=None):
+    """Filter data based on machine, month, or date range."""
+    filtered_data = df.copy()
+    
+    if machine != "Todas" and machine != "All":
+        filtered_data = filtered_data[filtered_data['Máquina'] == machine]
+    
+    # Filter by month if specified
+    if month and month != "Todos" and month != "All":
+        filtered_data = filtered_data[filtered_data['Ano-Mês'] == month]
+    
+    # Filter by date range if specified (overrides month filter)
+    if start_date and end_date:
+        filtered_data = filtered_data[(filtered_data['Inicio'] >= start_date) & 
+                                      (filtered_data['Inicio'] <= end_date)]
+    
+    return filtered_data
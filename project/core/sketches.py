@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from core.aggregates import PARTITION_KEYS
+
+# Esboços de quantis mescláveis (no estilo do DDSketch) para a duração das paradas.
+# Cada duração é contada em um balde logarítmico; os baldes garantem erro relativo
+# máximo de RELATIVE_ACCURACY em qualquer percentil, e esboços de partições diferentes
+# são combinados somando as contagens dos baldes.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = np.log(GAMMA)
+
+# Durações menores que este valor (minutos) são contadas no balde zero
+MIN_MINUTES = 1e-3
+ZERO_BUCKET = -(2 ** 31)
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+def duration_buckets(durations):
+    """Calcula o balde logarítmico de cada duração (timedelta)."""
+    minutes = durations.dt.total_seconds().to_numpy() / 60
+    buckets = np.ceil(np.log(np.maximum(minutes, MIN_MINUTES)) / LOG_GAMMA)
+    return np.where(minutes >= MIN_MINUTES, buckets, ZERO_BUCKET).astype(np.int64)
+
+def bucket_values(buckets):
+    """Valor representativo (minutos) de cada balde: erro relativo máximo RELATIVE_ACCURACY."""
+    buckets = np.asarray(buckets)
+    return np.where(buckets == ZERO_BUCKET, 0.0, 2 * GAMMA ** buckets.astype(np.float64) / (GAMMA + 1))
+
+def build_duration_sketches(df):
+    """
+    Calcula os esboços de duração por partição (máquina, dia, área, causa).
+
+    Returns:
+        pd.Series: Contagem de paradas indexada por PARTITION_KEYS + ['Balde']
+    """
+    if df.empty:
+        index = pd.MultiIndex.from_arrays([[]] * (len(PARTITION_KEYS) + 1), names=PARTITION_KEYS + ['Balde'])
+        return pd.Series(dtype='int64', index=index, name='count')
+
+    keys = [
+        df['Máquina'], df['Inicio'].dt.normalize().rename('Dia'), df['Área Responsável'], df['Parada'],
+        pd.Series(duration_buckets(df['Duração']), index=df.index, name='Balde'),
+    ]
+    return df.groupby(keys, dropna=False, observed=True).size().rename('count')
+
+def merge_sketches(sketches, new_sketches):
+    """Combina dois conjuntos de esboços (por exemplo, histórico + paradas novas)."""
+    if sketches.empty:
+        return new_sketches
+    if new_sketches.empty:
+        return sketches
+    merged = pd.concat([sketches, new_sketches])
+    return merged.groupby(level=list(range(merged.index.nlevels)), dropna=False, sort=False, observed=True).sum()
+
+def update_sketches(sketches, new_rows):
+    """Incorpora novas paradas aos esboços por partição."""
+    return merge_sketches(sketches, build_duration_sketches(new_rows))
+
+def _quantiles(counts, buckets, quantiles):
+    """Percentis de um esboço (contagens dos baldes, em ordem crescente de balde)."""
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(quantiles) * (cumulative[-1] - 1)
+    positions = np.searchsorted(cumulative, ranks, side='right')
+    return bucket_values(buckets[positions])
+
+def sketch_quantiles(sketches, by=None, quantiles=DEFAULT_QUANTILES):
+    """
+    Calcula percentis da duração (minutos) a partir dos esboços combinados.
+
+    Args:
+        sketches: Esboços por partição (build_duration_sketches), já filtrados
+        by: Nível de agrupamento ('Máquina', 'Área Responsável', 'Parada') ou None
+            para o conjunto todo
+        quantiles: Quantis desejados
+
+    Returns:
+        pd.DataFrame: Colunas p50, p90, ... por grupo (uma linha quando by é None)
+    """
+    columns = [f"p{q * 100:g}" for q in quantiles]
+    if sketches.empty:
+        return pd.DataFrame(columns=columns)
+
+    if by is None:
+        counts = sketches.groupby(level='Balde').sum()
+        return pd.DataFrame([_quantiles(counts.to_numpy(), counts.index.to_numpy(), quantiles)], columns=columns)
+
+    # Grupos contíguos, com os baldes em ordem crescente dentro de cada grupo
+    counts = sketches.groupby(level=[by, 'Balde'], observed=True).sum()
+    values, buckets = counts.to_numpy(), counts.index.get_level_values('Balde').to_numpy()
+    groups = counts.index.get_level_values(by)
+    bounds = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1], True])
+    return pd.DataFrame(
+        [_quantiles(values[start:stop], buckets[start:stop], quantiles) for start, stop in zip(bounds[:-1], bounds[1:])],
+        index=pd.Index(groups[bounds[:-1]], name=by),
+        columns=columns
+    )
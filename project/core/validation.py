@@ -0,0 +1,177 @@
+"""
+Data-quality validation of raw stoppage exports.
+
+process_data drops rows without essential values and coerces unreadable
+timestamps to NaT without telling anyone. validate_data runs the checks below
+over the raw frame, each one a vectorized mask, and returns a compact report
+(one line per check with its row count and a few example rows) plus a per-row
+bit mask of the checks each row failed.
+
+Checks are individually switchable: the cheap ones are O(rows) column
+comparisons; 'duplicates' and 'overlaps' hash or sort the rows and can be
+disabled on large production loads (PAINEL_VALIDATION_CHECKS=cheap).
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+ESSENTIAL_COLUMNS = ['Máquina', 'Inicio', 'Fim', 'Duração']
+
+# Columns identifying a stoppage for the duplicate check
+DUPLICATE_KEY = ['Máquina', 'Inicio', 'Fim', 'Parada']
+
+# Largest accepted difference between Duração and Fim - Inicio (exports round durations)
+DURATION_TOLERANCE = pd.Timedelta(minutes=1)
+
+# Example row labels kept per check in the report
+MAX_EXAMPLES = 5
+
+# name: (bit of the per-row flags, description, cheap)
+CHECKS = {
+    'missing_essentials': (1 << 0, 'Máquina, Inicio, Fim ou Duração ausente', True),
+    'invalid_timestamps': (1 << 1, 'Inicio, Fim ou Duração ilegível', True),
+    'end_before_start': (1 << 2, 'Fim anterior ao Inicio', True),
+    'negative_duration': (1 << 3, 'Duração negativa', True),
+    'duration_mismatch': (1 << 4, 'Duração diferente de Fim − Inicio', True),
+    'duplicates': (1 << 5, 'Parada repetida (mesma máquina, início, fim e causa)', False),
+    'overlaps': (1 << 6, 'Parada sobreposta a outra da mesma máquina', False),
+}
+
+CHEAP_CHECKS = tuple(name for name, (_, _, cheap) in CHECKS.items() if cheap)
+
+
+def parse_checks(spec):
+    """Parse a check selection: 'all', 'cheap', 'none' or a comma-separated list of check names."""
+    spec = (spec or 'all').strip().lower()
+    if spec == 'all':
+        return tuple(CHECKS)
+    if spec == 'cheap':
+        return CHEAP_CHECKS
+    if spec == 'none':
+        return ()
+    checks = tuple(name.strip() for name in spec.split(',') if name.strip())
+    unknown = [name for name in checks if name not in CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown validation checks: {', '.join(unknown)} (expected {', '.join(CHECKS)})")
+    return checks
+
+
+# Checks run by default
+DEFAULT_CHECKS = parse_checks(os.environ.get('PAINEL_VALIDATION_CHECKS', 'all'))
+
+ValidationResult = namedtuple('ValidationResult', ['report', 'flags'])
+
+
+def _as_datetime(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors='coerce')
+
+
+def _as_timedelta(values):
+    if pd.api.types.is_timedelta64_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_timedelta(values, errors='coerce')
+    # Strings and datetime.time cells ('hh:mm:ss'): exports repeat the same few
+    # thousand durations, so each distinct value is parsed once
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_timedelta(pd.Index(uniques).astype(str), errors='coerce').to_numpy()
+    return pd.Series(np.append(parsed, np.timedelta64('NaT'))[codes], index=values.index)
+
+
+def _column(df, name):
+    return df[name] if name in df.columns else pd.Series(np.nan, index=df.index, dtype='float64')
+
+
+def _overlaps(machine, start, end):
+    """Rows starting before a previous stoppage of the same machine has ended."""
+    valid = (machine.notna() & start.notna() & end.notna()).to_numpy()
+    codes = pd.factorize(machine)[0]
+    start_ns = start.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    end_ns = end.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+    rows = np.flatnonzero(valid)
+    order = rows[np.lexsort((start_ns[rows], codes[rows]))]
+    ordered_codes, ordered_end = codes[order], end_ns[order]
+    # Latest end among the earlier stoppages of the same machine
+    latest_end = pd.Series(ordered_end).groupby(ordered_codes).cummax().to_numpy()
+    previous_end = np.r_[np.iinfo(np.int64).min, latest_end[:-1]]
+    same_machine = np.r_[False, ordered_codes[1:] == ordered_codes[:-1]]
+
+    mask = np.zeros(len(machine), dtype=bool)
+    mask[order] = same_machine & (start_ns[order] < previous_end)
+    return mask
+
+
+def validate_data(df, checks=None):
+    """
+    Run the data-quality checks over a raw stoppage export.
+
+    Args:
+        df: DataFrame as read from the workbook (before process_data)
+        checks: Names of the checks to run (default DEFAULT_CHECKS, see CHECKS)
+
+    Returns:
+        ValidationResult: report (DataFrame with columns check, description, rows,
+            examples; one line per check run) and flags (uint8 Series aligned with
+            df, with the CHECKS bit of every check the row failed)
+    """
+    checks = DEFAULT_CHECKS if checks is None else tuple(checks)
+    unknown = [name for name in checks if name not in CHECKS]
+    if unknown:
+        raise ValueError(f"Unknown validation checks: {', '.join(unknown)}")
+
+    raw = {name: _column(df, name) for name in ESSENTIAL_COLUMNS}
+    start, end = _as_datetime(raw['Inicio']), _as_datetime(raw['Fim'])
+    duration = _as_timedelta(raw['Duração'])
+
+    masks = {}
+    if 'missing_essentials' in checks:
+        masks['missing_essentials'] = pd.concat(raw, axis=1).isna().any(axis=1).to_numpy()
+    if 'invalid_timestamps' in checks:
+        masks['invalid_timestamps'] = (
+            (raw['Inicio'].notna() & start.isna())
+            | (raw['Fim'].notna() & end.isna())
+            | (raw['Duração'].notna() & duration.isna())
+        ).to_numpy()
+    if 'end_before_start' in checks:
+        masks['end_before_start'] = (end < start).to_numpy()
+    if 'negative_duration' in checks:
+        masks['negative_duration'] = (duration < pd.Timedelta(0)).to_numpy()
+    if 'duration_mismatch' in checks:
+        masks['duration_mismatch'] = ((duration - (end - start)).abs() > DURATION_TOLERANCE).to_numpy()
+    if 'duplicates' in checks:
+        columns = {'Máquina': raw['Máquina'], 'Inicio': start, 'Fim': end, 'Parada': _column(df, 'Parada')}
+        key = pd.DataFrame({name: columns[name] for name in DUPLICATE_KEY})
+        masks['duplicates'] = key.duplicated(keep='first').to_numpy()
+    if 'overlaps' in checks:
+        masks['overlaps'] = _overlaps(raw['Máquina'], start, end)
+
+    flags = np.zeros(len(df), dtype=np.uint8)
+    rows = []
+    for name in checks:
+        bit, description, _ = CHECKS[name]
+        mask = masks[name]
+        flags[mask] |= bit
+        positions = np.flatnonzero(mask)
+        rows.append({
+            'check': name,
+            'description': description,
+            'rows': len(positions),
+            'examples': df.index[positions[:MAX_EXAMPLES]].tolist(),
+        })
+
+    report = pd.DataFrame(rows, columns=['check', 'description', 'rows', 'examples'])
+    return ValidationResult(report, pd.Series(flags, index=df.index, name='flags'))
+
+
+def flag_names(flags):
+    """Names of the failed checks of each row ('' when none), computed once per distinct flag value."""
+    codes, uniques = pd.factorize(flags)
+    names = np.array([
+        ', '.join(name for name, (bit, _, _) in CHECKS.items() if value & bit) for value in uniques
+    ], dtype=object)
+    return pd.Series(names[codes], index=flags.index, name='issues')
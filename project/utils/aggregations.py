@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from core.cache import cached
+from utils.profiling import profiled
+
+# Display order of the weekday codes (Dia_Semana, Monday=0) starting from Sunday
+WEEKDAY_DISPLAY_ORDER = [6, 0, 1, 2, 3, 4, 5]
+
+def _duration_hours(df):
+    """Return the stoppage durations in hours as a float Series (vectorized)."""
+    return df['Duração'].dt.total_seconds() / 3600
+
+def _summarize(df, key, statistics):
+    """Group the durations (in hours) by the precomputed column key."""
+    hours = _duration_hours(df)
+    return hours.groupby(df[key], observed=True).agg(statistics)
+
+@profiled(cache=cached('calculations'))
+def summarize_by_machine(df):
+    """
+    Summarize the stoppages per machine.
+
+    Returns:
+        pd.DataFrame: Columns 'count', 'total_hours' and 'mean_hours' indexed by Máquina
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['count', 'total_hours', 'mean_hours'])
+    summary = _summarize(df, 'Máquina', ['count', 'sum', 'mean'])
+    summary.columns = ['count', 'total_hours', 'mean_hours']
+    return summary
+
+@profiled(cache=cached('calculations'))
+def summarize_by_weekday(df):
+    """
+    Summarize the stoppages per weekday, using the precomputed Dia_Semana codes.
+
+    Returns:
+        pd.DataFrame: Columns 'count' and 'total_hours' indexed by weekday code
+            (Monday=0), in display order starting from Sunday; empty days are kept
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['count', 'total_hours'])
+    summary = _summarize(df, 'Dia_Semana', ['count', 'sum'])
+    summary.columns = ['count', 'total_hours']
+    return summary.reindex(WEEKDAY_DISPLAY_ORDER, fill_value=0)
+
+@profiled(cache=cached('calculations'))
+def summarize_by_hour(df):
+    """
+    Summarize the stoppages per hour of day, using the precomputed Hora column.
+
+    Returns:
+        pd.DataFrame: Columns 'count' and 'total_hours' indexed by hour (0-23)
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['count', 'total_hours'])
+    summary = _summarize(df, 'Hora', ['count', 'sum'])
+    summary.columns = ['count', 'total_hours']
+    summary.index = summary.index.astype(np.int64)
+    return summary
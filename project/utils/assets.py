@@ -0,0 +1,106 @@
+import os
+import time
+import threading
+import http.client
+import urllib.request
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Images bundled with the application (checked first)
+ASSETS_DIR = os.path.join(PROJECT_DIR, 'assets')
+
+# Local copies of remote images downloaded on first use
+CACHE_DIR = os.environ.get('PAINEL_ASSET_CACHE_DIR', os.path.join(PROJECT_DIR, '.cache', 'assets'))
+
+# Offline mode: never try the network, use only bundled or cached files
+OFFLINE = os.environ.get('PAINEL_OFFLINE', '0') == '1'
+
+DOWNLOAD_TIMEOUT = float(os.environ.get('PAINEL_ASSET_TIMEOUT', '3'))
+
+# A failed download is not retried before this many seconds
+RETRY_AFTER = 300
+
+ASSETS = {
+    'britvic_logo': {
+        'file': 'britvic_logo.png',
+        'url': 'https://raw.githubusercontent.com/martins6231/app_atd/main/britvic_logo.png',
+    },
+    'factory_icon': {
+        'file': 'factory.png',
+        'url': 'https://img.icons8.com/fluency/240/factory.png',
+    },
+}
+
+_memory = {}
+_failures = {}
+_pending = set()
+_lock = threading.Lock()
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as asset_file:
+            return asset_file.read()
+    except OSError:
+        return None
+
+
+def _download(url, path):
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        content = response.read()
+    # Written under a temporary name, so a concurrent reader never sees a partial file
+    partial = f'{path}.{threading.get_ident()}.part'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(partial, 'wb') as asset_file:
+            asset_file.write(content)
+        os.replace(partial, path)
+    except OSError:
+        # Read-only file system: keep serving from memory
+        pass
+    return content
+
+
+def _fetch(name):
+    asset = ASSETS[name]
+    try:
+        content = _download(asset['url'], os.path.join(CACHE_DIR, asset['file']))
+    except (OSError, http.client.HTTPException, ValueError):
+        content = None
+    with _lock:
+        if content is None:
+            _failures[name] = time.time()
+        else:
+            _memory.setdefault(name, content)
+        _pending.discard(name)
+
+
+def get_asset(name):
+    """
+    Return the bytes of a static asset, or None if it is unavailable.
+
+    Lookup order: memory, bundled file in assets/, local cache, remote URL
+    (skipped in offline mode). The download runs in a background thread and
+    this call returns None meanwhile, so no script run waits on the network,
+    not even the first one on a site without internet access; the asset is
+    served from memory on the following runs.
+
+    Files are read without holding the lock; the lock only guards publishing
+    the result and starting a single download per asset.
+    """
+    content = _memory.get(name)
+    if content is not None:
+        return content
+
+    asset = ASSETS[name]
+    content = _read(os.path.join(ASSETS_DIR, asset['file'])) or _read(os.path.join(CACHE_DIR, asset['file']))
+
+    with _lock:
+        if content is not None:
+            # Another session may have loaded it meanwhile: every caller gets the same bytes
+            return _memory.setdefault(name, content)
+        if OFFLINE or name in _pending or time.time() - _failures.get(name, 0) <= RETRY_AFTER:
+            return None
+        _pending.add(name)
+    threading.Thread(target=_fetch, args=(name,), name=f'painel-asset-{name}', daemon=True).start()
+    return None
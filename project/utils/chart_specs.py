@@ -0,0 +1,129 @@
+"""
+Pre-serialized Plotly charts.
+
+st.plotly_chart converts the figure to a dict and serializes it to JSON on every
+rerun, even when nothing changed. Here each chart is serialized once per
+(result fingerprint, chart, language) and the JSON spec is kept in the shared
+cache; render_chart_spec hands the spec to the frontend as is, so reruns that
+only switch tabs or toggle unrelated widgets do no chart serialization at all
+(on the Streamlit versions in FAST_PATH_VERSIONS; elsewhere it falls back to
+st.plotly_chart with the figure kept next to the spec).
+"""
+import json
+import logging
+from collections import namedtuple
+
+import streamlit as st
+
+from core.cache import get_backend, make_key
+from utils.lazy_imports import LazyModule
+from utils.profiling import profile_block
+
+pio = LazyModule('plotly.io')
+go = LazyModule('plotly.graph_objects')
+
+# Layer of the shared cache holding the serialized charts
+SPEC_LAYER = 'chart_specs'
+
+# Streamlit versions whose internals _enqueue_spec uses (other versions use st.plotly_chart)
+FAST_PATH_VERSIONS = ('1.66.',)
+
+# Default height of plotly.js (and of st.plotly_chart) when the layout sets none
+DEFAULT_HEIGHT = 450
+
+# The figure is kept for the st.plotly_chart fallback, so it is never rebuilt (and
+# validated) from the JSON spec
+ChartSpec = namedtuple('ChartSpec', ['spec', 'height', 'figure'], defaults=(None,))
+
+logger = logging.getLogger(__name__)
+_fallback_logged = False
+
+
+def fingerprint(*values):
+    """Fingerprint of the inputs a set of charts is built from (content hash)."""
+    return make_key('chart_fingerprint', values, {})
+
+
+def get_chart_spec(result_fingerprint, chart, language, build):
+    """
+    Return the ChartSpec of a chart, building and serializing it only on a cache miss.
+
+    Args:
+        result_fingerprint: Fingerprint of the results the chart is built from
+        chart: Name of the chart (unique within the results)
+        language: Language of the chart labels
+        build: Callable returning the Plotly figure (or None when there is no data)
+
+    Returns:
+        ChartSpec or None when build returned None
+    """
+    backend = get_backend()
+    key = make_key('chart_spec', (result_fingerprint, chart, language), {})
+    hit, spec = backend.get(key, SPEC_LAYER)
+    if hit:
+        return spec
+
+    fig = build()
+    if fig is not None:
+        with profile_block(f'chart_spec.{chart}', kind='render'):
+            spec = ChartSpec(pio.to_json(fig, validate=False), fig.layout.height or DEFAULT_HEIGHT, fig)
+    backend.put(key, spec, SPEC_LAYER)
+    return spec
+
+
+def _enqueue_spec(chart_spec, key):
+    """Send a serialized chart to the frontend, the way st.plotly_chart does after serializing it."""
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+    from streamlit.elements.lib.form_utils import current_form_id
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+
+    dg = st._main
+    proto = PlotlyChartProto()
+    proto.theme = 'streamlit'
+    proto.form_id = current_form_id(dg)
+    proto.spec = chart_spec.spec
+    proto.config = json.dumps({})
+    proto.id = compute_and_register_element_id(
+        'plotly_chart',
+        user_key=key,
+        key_as_main_identity=False,
+        dg=dg,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        theme='streamlit',
+        width='stretch',
+        height=chart_spec.height,
+    )
+    dg._enqueue('plotly_chart', proto, layout_config=LayoutConfig(width='stretch', height=chart_spec.height))
+
+
+def render_chart_spec(chart_spec, key):
+    """
+    Display a pre-serialized chart in the active container, full width.
+
+    The spec is handed over as is only on the Streamlit versions the internal
+    calls were written for (FAST_PATH_VERSIONS); elsewhere, or if those calls
+    fail (logged once per process), the stored figure goes through the public
+    st.plotly_chart, which serializes it again.
+
+    Args:
+        chart_spec: ChartSpec from get_chart_spec
+        key: Key of the chart element, unique within the page
+    """
+    global _fallback_logged
+    if st.__version__.startswith(FAST_PATH_VERSIONS):
+        try:
+            _enqueue_spec(chart_spec, key)
+            return
+        except Exception:
+            if not _fallback_logged:
+                logger.warning('Pre-serialized chart fast path failed; using st.plotly_chart', exc_info=True)
+                _fallback_logged = True
+    elif not _fallback_logged:
+        logger.info('Streamlit %s is not in FAST_PATH_VERSIONS; charts use st.plotly_chart', st.__version__)
+        _fallback_logged = True
+    figure = chart_spec.figure
+    if figure is None:
+        figure = go.Figure(json.loads(chart_spec.spec), skip_invalid=True)
+    st.plotly_chart(figure, use_container_width=True, key=key)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from core.cache import cached
+from utils.profiling import profiled
+
+@profiled(cache=cached('grid'))
+def sort_positions(df, column, ascending=True):
+    """Return the row positions of df ordered by column (stable, missing values last)."""
+    values = df[column].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+@profiled(cache=cached('grid'))
+def filter_positions(df, column, query):
+    """Return a boolean mask of the rows whose column contains query (case-insensitive)."""
+    values = df[column]
+    if values.dtype == object or isinstance(values.dtype, (pd.CategoricalDtype, pd.StringDtype)):
+        # Match on the distinct values only, then broadcast through the codes
+        codes, uniques = pd.factorize(values)
+        matches = pd.Series(uniques.astype(str)).str.contains(query, case=False, regex=False).to_numpy()
+        return np.where(codes >= 0, matches[codes], False)
+    return values.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+
+@profiled(cache=cached('grid'))
+def grid_positions(df, sort_column=None, ascending=True, filters=None):
+    """Return the row positions of df after sorting and filtering."""
+    if sort_column:
+        positions = sort_positions(df, sort_column, ascending)
+    else:
+        positions = np.arange(len(df))
+
+    for column, query in (filters or {}).items():
+        if query:
+            mask = filter_positions(df, column, query)
+            positions = positions[mask[positions]]
+
+    return positions
+
+def get_page(df, page, page_size, sort_column=None, ascending=True, filters=None):
+    """
+    Return one page of df with sorting and column filters applied server-side.
+
+    Sort orders, filter masks and their combination are cached per dataset, so
+    flipping pages only slices the precomputed positions and materializes the
+    visible rows.
+
+    Args:
+        df: DataFrame to be paginated
+        page: Page number, starting at 1
+        page_size: Number of rows per page
+        sort_column: Optional column used to sort the rows
+        ascending: Sort direction
+        filters: Optional dict {column: text} of case-insensitive "contains" filters
+
+    Returns:
+        tuple: (DataFrame with the rows of the page, total number of matching rows)
+    """
+    positions = grid_positions(df, sort_column, ascending, filters)
+    total_rows = len(positions)
+    start = (max(page, 1) - 1) * page_size
+    return df.iloc[positions[start:start + page_size]], total_rows
@@ -1,6 +1,8 @@
-import streamlit as st
-import json
-from functools import lru_cache
+import sys
+import numpy as np
+import pandas as pd
+
+DEFAULT_LANGUAGE = 'pt'
 
 # Define translations
 translations = {
@@ -112,10 +114,16 @@ translations = {
         "stoppages_by_month_title": "Taxa de Ocorrência de Paradas por Mês",
         "total_duration_by_month_title": "Duração Total de Paradas por Mês",
         "total_time_by_area_title": "Tempo Total de Paradas por Área",
-        "critical_stoppages_title": "Top 10 Paradas Críticas (>1h)",
+        "critical_stoppages_title": "Top 10 Paradas Críticas (>{limit})",
         "critical_stoppages_by_area_title": "Distribuição de Paradas Críticas por Área",
         "duration_distribution_title": "Distribuição da Duração das Paradas",
         "total_duration_by_machine": "Duração Total por Máquina",
+        "stoppages_by_day_title": "Paradas por Dia",
+        "duration_by_day_title": "Duração Total de Paradas por Dia",
+        "stoppages_by_hour_title": "Paradas por Hora",
+        "duration_by_hour_title": "Duração Total de Paradas por Hora",
+        "date": "Data",
+        "downsampled_points": "{shown} de {total} pontos",
         
         # Comparison page
         "period_comparison": "Comparação de Períodos",
@@ -159,6 +167,13 @@ translations = {
         "develop_comprehensive_action_plan": "Desenvolva um plano de ação abrangente",
         "establish_monitoring_mechanisms": "Estabeleça mecanismos de monitoramento mais rigorosos",
         "download_comparison": "Baixar comparação",
+        "duration_percentiles": "Percentis de Duração das Paradas",
+        "percentiles_by": "Percentis por",
+        "by_machine": "Máquina",
+        "by_area": "Área",
+        "by_cause": "Causa",
+        "overall": "Geral",
+        "approximate_percentiles": "Valores aproximados em minutos (erro relativo máximo de {accuracy:.0%}).",
         
         # Data page
         "data_visualization": "Visualização dos Dados",
@@ -177,6 +192,14 @@ translations = {
         "distribution_by_hour": "Distribuição por Hora do Dia",
         "weekday": "Dia da Semana",
         "hour_of_day": "Hora do Dia",
+        "server_pagination": "Paginação no servidor",
+        "sort_by": "Ordenar por",
+        "descending": "Ordem decrescente",
+        "filter_column": "Filtrar coluna",
+        "filter_value": "Contém",
+        "rows_per_page": "Linhas por página",
+        "page": "Página",
+        "records": "registros",
         
         # About page
         "about_the_application": "Sobre a Aplicação",
@@ -307,10 +330,16 @@ translations = {
         "stoppages_by_month_title": "Stoppage Occurrence Rate by Month",
         "total_duration_by_month_title": "Total Stoppage Duration by Month",
         "total_time_by_area_title": "Total Stoppage Time by Area",
-        "critical_stoppages_title": "Top 10 Critical Stoppages (>1h)",
+        "critical_stoppages_title": "Top 10 Critical Stoppages (>{limit})",
         "critical_stoppages_by_area_title": "Distribution of Critical Stoppages by Area",
         "duration_distribution_title": "Distribution of Stoppage Durations",
         "total_duration_by_machine": "Total Duration by Machine",
+        "stoppages_by_day_title": "Stoppages by Day",
+        "duration_by_day_title": "Total Stoppage Duration by Day",
+        "stoppages_by_hour_title": "Stoppages by Hour",
+        "duration_by_hour_title": "Total Stoppage Duration by Hour",
+        "date": "Date",
+        "downsampled_points": "{shown} of {total} points",
         
         # Comparison page
         "period_comparison": "Period Comparison",
@@ -354,6 +383,13 @@ translations = {
         "develop_comprehensive_action_plan": "Develop comprehensive action plan",
         "establish_monitoring_mechanisms": "Establish more rigorous monitoring mechanisms",
         "download_comparison": "Download comparison",
+        "duration_percentiles": "Stoppage Duration Percentiles",
+        "percentiles_by": "Percentiles by",
+        "by_machine": "Machine",
+        "by_area": "Area",
+        "by_cause": "Cause",
+        "overall": "Overall",
+        "approximate_percentiles": "Approximate values in minutes (maximum relative error of {accuracy:.0%}).",
         
         # Data page
         "data_visualization": "Data Visualization",
@@ -372,6 +408,14 @@ translations = {
         "distribution_by_hour": "Distribution by Hour of Day",
         "weekday": "Weekday",
         "hour_of_day": "Hour of Day",
+        "server_pagination": "Server-side pagination",
+        "sort_by": "Sort by",
+        "descending": "Descending order",
+        "filter_column": "Filter column",
+        "filter_value": "Contains",
+        "rows_per_page": "Rows per page",
+        "page": "Page",
+        "records": "records",
         
         # About page
         "about_the_application": "About the Application",
@@ -396,27 +440,104 @@ translations = {
     }
 }
 
-@lru_cache(maxsize=128)
+def _session_language():
+    """Return the language of the current Streamlit session, if any."""
+    # Batch jobs never import streamlit; there is no session language there
+    if 'streamlit' not in sys.modules:
+        return None
+    import streamlit as st
+    return st.session_state.get('language')
+
+class Catalog(dict):
+    """Translations of one language; missing keys fall back to the key itself."""
+
+    def __missing__(self, key):
+        return key
+
+# Catalogs compiled once at import: English fills the keys a language lacks, so a
+# lookup is a single dict access
+CATALOGS = {
+    language: Catalog({**translations['en'], **strings})
+    for language, strings in translations.items()
+}
+
+TRANSLATORS = {language: catalog.__getitem__ for language, catalog in CATALOGS.items()}
+
+def current_language(language=None):
+    """Return the given language, or the one of the current session, or the default."""
+    if language not in CATALOGS:
+        language = _session_language()
+    return language if language in CATALOGS else DEFAULT_LANGUAGE
+
 def get_translation(language=None):
-    """Get translations for the specified language."""
-    if language is None and 'language' in st.session_state:
-        language = st.session_state.language
-    elif language is None:
-        language = 'pt'  # Default to Portuguese
+    """
+    Get the translation function for the specified language.
     
-    def translate(key):
-        if key in translations[language]:
-            return translations[language][key]
-        # Fallback to English if key not found in current language
-        elif key in translations['en']:
-            return translations['en'][key]
-        else:
-            return key  # Return the key itself if not found in any language
+    Without a language, the language of the current session is used; it is looked
+    up on every call, so each session gets its own language.
+    """
+    return TRANSLATORS[current_language(language)]
+
+class Formatter:
+    """
+    Locale formatting of numbers, dates and durations for one language.
     
-    return translate
+    Every method takes a scalar or a Series (or array) and returns a string or a
+    Series of strings; missing values stay missing (NaN, for scalars and Series alike).
+    """
+
+    def __init__(self, decimal, thousands, date, datetime):
+        self.date_format = date
+        self.datetime_format = datetime
+        # Numbers are formatted in the C locale, then the separators are swapped
+        self._separators = str.maketrans({',': thousands, '.': decimal}) if (decimal, thousands) != ('.', ',') else None
+
+    def _localize(self, text):
+        return text if self._separators is None else text.translate(self._separators)
+
+    def number(self, values, decimals=1, suffix='', signed=False):
+        """Format numbers with thousands separators and a fixed number of decimals."""
+        template = f"{{:{'+' if signed else ''},.{decimals}f}}"
+
+        def format_value(value):
+            return self._localize(template.format(value)) + suffix
+
+        if np.ndim(values) == 0:
+            return np.nan if pd.isna(values) else format_value(values)
+        return pd.Series(values).map(format_value, na_action='ignore')
+
+    def percent(self, values, decimals=1, signed=False):
+        return self.number(values, decimals, '%', signed)
+
+    def duration(self, values, unit='h', decimals=1, signed=False):
+        """Format timedeltas as hours ('h') or minutes ('min')."""
+        seconds = {'h': 3600, 'min': 60}[unit]
+        if np.ndim(values) == 0:
+            hours = pd.Timedelta(values).total_seconds() / seconds
+        else:
+            hours = pd.to_timedelta(pd.Series(values)).dt.total_seconds() / seconds
+        return self.number(hours, decimals, unit, signed)
+
+    def date(self, values, with_time=False):
+        """Format dates (or date-times) in the order of the language."""
+        date_format = self.datetime_format if with_time else self.date_format
+        if np.ndim(values) == 0:
+            # NaT and None stay missing, as in the Series branch
+            return np.nan if pd.isna(values) else pd.Timestamp(values).strftime(date_format)
+        return pd.to_datetime(pd.Series(values)).dt.strftime(date_format)
+
+FORMATTERS = {
+    'pt': Formatter(decimal=',', thousands='.', date='%d/%m/%Y', datetime='%d/%m/%Y %H:%M'),
+    'en': Formatter(decimal='.', thousands=',', date='%m/%d/%Y', datetime='%m/%d/%Y %H:%M'),
+}
+
+def get_formatter(language=None):
+    """Get the number/date/duration formatter of the language (or of the current session)."""
+    return FORMATTERS[current_language(language)]
 
 def setup_language_selector():
     """Set up the language selector in the sidebar."""
+    import streamlit as st
     st.sidebar.title("🌐 " + ("Language" if st.session_state.language == 'en' else "Idioma"))
     
     # Create a container for the language buttons
@@ -0,0 +1,24 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Module proxy that imports the real module on first attribute access.
+
+    Used for heavy libraries (plotly.express, plotly.graph_objects) so that
+    importing a page or utils module does not pay for them until a chart is
+    actually built.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
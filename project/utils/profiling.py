@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import threading
+import tracemalloc
+import functools
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Profiling is opt-in: set PAINEL_PROFILING=1 or enable it from the admin panel
+_enabled = os.environ.get('PAINEL_PROFILING', '0') == '1'
+
+LOG_PATH = os.environ.get('PAINEL_PROFILING_LOG', os.path.join('logs', 'profiling.jsonl'))
+MAX_RECORDS = int(os.environ.get('PAINEL_PROFILING_MAX_RECORDS', '2000'))
+
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def is_enabled():
+    """Return True if profiling is currently active."""
+    return _enabled
+
+
+def set_enabled(enabled):
+    """Enable or disable profiling for the whole process."""
+    global _enabled
+    _enabled = bool(enabled)
+    if _enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not _enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def get_records():
+    """Return a snapshot of the recorded measurements (oldest first)."""
+    with _lock:
+        return list(_records)
+
+
+def clear_records():
+    """Discard all in-memory measurements."""
+    with _lock:
+        _records.clear()
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _memory():
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+def _write_log(record):
+    try:
+        directory = os.path.dirname(LOG_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(LOG_PATH, 'a', encoding='utf-8') as log_file:
+            log_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError:
+        # The log is best effort; measurements stay available in memory
+        pass
+
+
+def _record(name, kind, started, wall_time, memory_before, cache=None):
+    record = {
+        'timestamp': datetime.fromtimestamp(started).isoformat(timespec='milliseconds'),
+        'name': name,
+        'kind': kind,
+        'depth': len(_stack()),
+        'wall_ms': round(wall_time * 1000, 3),
+        'cache': cache,
+        'memory_delta_kb': round((_memory() - memory_before) / 1024, 1),
+    }
+    with _lock:
+        _records.append(record)
+    _write_log(record)
+
+
+@contextmanager
+def profile_block(name, kind='block'):
+    """Measure an arbitrary block of code (Excel parsing, chart serialization, ...)."""
+    if not _enabled:
+        yield
+        return
+
+    started = time.time()
+    memory_before = _memory()
+    start = time.perf_counter()
+    _stack().append(name)
+    try:
+        yield
+    finally:
+        _stack().pop()
+        _record(name, kind, started, time.perf_counter() - start, memory_before)
+
+
+def profiled(func=None, *, cache=None, kind='function', name=None):
+    """
+    Decorator that records wall time, cache hit/miss and memory delta.
+
+    Args:
+        func: Function to be instrumented
+        cache: Optional caching decorator (e.g. cached('calculations')) applied to func;
+            when given, a call that does not execute the function body is
+            recorded as a cache hit, and its wall time is the hashing/lookup cost
+        kind: Category shown in the admin panel ('function', 'page', ...)
+        name: Name used in the records (defaults to module.function)
+    """
+    if func is None:
+        return lambda f: profiled(f, cache=cache, kind=kind, name=name)
+
+    label = name or f"{func.__module__.split('.')[-1]}.{func.__name__}"
+
+    if cache is None:
+        target = func
+    else:
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            _local.executed = getattr(_local, 'executed', 0) + 1
+            return func(*args, **kwargs)
+
+        target = cache(body)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return target(*args, **kwargs)
+
+        started = time.time()
+        memory_before = _memory()
+        executed_before = getattr(_local, 'executed', 0)
+        start = time.perf_counter()
+        _stack().append(label)
+        try:
+            return target(*args, **kwargs)
+        finally:
+            _stack().pop()
+            wall_time = time.perf_counter() - start
+            cache_status = None
+            if cache is not None:
+                cache_status = 'miss' if getattr(_local, 'executed', 0) > executed_before else 'hit'
+            _record(label, kind, started, wall_time, memory_before, cache_status)
+
+    # Keep access to the cache API (e.g. .clear()) of the wrapped function
+    if hasattr(target, 'clear'):
+        wrapper.clear = target.clear
+
+    return wrapper
+
+
+if _enabled:
+    set_enabled(True)
@@ -1,61 +1,176 @@
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import streamlit as st
-from utils.i18n import get_translation
+from utils.i18n import get_translation, get_formatter
+from core.cache import cached
+from utils.lazy_imports import LazyModule
+from utils.profiling import profiled
+from core.downsampling import downsample_indices
 
-@st.cache_data
-def create_pareto_chart(pareto, language='pt'):
-    """Create a Pareto chart with Plotly."""
+# Plotly is only imported when the first chart is built
+go = LazyModule('plotly.graph_objects')
+colors = LazyModule('plotly.colors')
+
+# Layout shared by every chart; builders only add what differs (title, axes, margins)
+LAYOUT_TEMPLATE = {
+    'autosize': True,
+    'margin': dict(l=50, r=50, t=80, b=50),
+    'plot_bgcolor': 'rgba(0,0,0,0)',
+    'hoverlabel': dict(bgcolor="white", font_size=12, font_family="Arial"),
+    'title': {
+        'y':0.95,
+        'x':0.5,
+        'xanchor': 'center',
+        'yanchor': 'top'
+    },
+    'showlegend': False,
+}
+
+# Points sent for a trend chart: about one per pixel of a full-width chart
+TREND_MAX_POINTS = 1200
+
+# Above this many points trend charts are drawn with WebGL (scattergl)
+WEBGL_THRESHOLD = 2000
+
+TREND_TITLES = {
+    ('Paradas', 'D'): 'stoppages_by_day_title',
+    ('Duração (h)', 'D'): 'duration_by_day_title',
+    ('Paradas', 'h'): 'stoppages_by_hour_title',
+    ('Duração (h)', 'h'): 'duration_by_hour_title',
+}
+
+PIE_LEGEND = dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+
+BAR_STYLE = {
+    'textposition': 'outside',
+    'width': 0.7,
+    'marker': {'line': {'width': 1, 'color': 'rgba(0,0,0,0.1)'}},
+}
+
+def _layout(title=None, **overrides):
+    """Chart layout: LAYOUT_TEMPLATE with the given overrides (dict values are merged one level deep)."""
+    layout = dict(LAYOUT_TEMPLATE)
+    if title is not None:
+        overrides['title'] = {'text': title, **overrides.get('title', {})}
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(layout.get(key), dict):
+            value = {**layout[key], **value}
+        layout[key] = value
+    return layout
+
+def _axis(title, **options):
+    return {'title': {'text': title}, **options}
+
+def _figure(traces, layout):
+    """
+    Build a figure from plain trace and layout dicts.
+
+    The dicts are assembled by this module, so Plotly's per-property validation
+    (most of the cost of px.* and of graph_objects constructors) is skipped.
+    """
+    return go.Figure(data=traces, layout=layout, _validate=False)
+
+def _hovertemplate(x_label, y_label):
+    return f"{x_label}=%{{x}}<br>{y_label}=%{{y}}<extra></extra>"
+
+def _bar(x, y, color, x_label, y_label, text=None, texttemplate=None, orientation='v'):
+    trace = {
+        'type': 'bar',
+        'x': x,
+        'y': y,
+        'orientation': orientation,
+        'marker': {'color': color, **BAR_STYLE['marker']},
+        'hovertemplate': _hovertemplate(x_label, y_label),
+        'textposition': BAR_STYLE['textposition'],
+        'width': BAR_STYLE['width'],
+    }
+    if text is not None:
+        trace['text'] = text
+    if texttemplate is not None:
+        trace['texttemplate'] = texttemplate
+    return trace
+
+def _pie(values, names, title, pull=None):
+    trace = {
+        'type': 'pie',
+        'values': values,
+        'labels': names,
+        'hole': 0.4,
+        'textposition': 'inside',
+        'textinfo': 'percent+label',
+        'marker': {'line': {'color': '#FFFFFF', 'width': 2}},
+        'textfont': {'size': 12},
+    }
+    if pull is not None:
+        trace['pull'] = pull
+    return _figure([trace], _layout(
+        title,
+        margin=dict(l=20, r=20, t=80, b=20),
+        legend=PIE_LEGEND,
+        showlegend=True,
+        piecolorway=colors.qualitative.Set3,
+    ))
+
+def _line_with_area(x, y, color, fill_color, x_label, y_label, labels, title):
+    """Line chart with markers, the area under the line and a label above each point."""
+    traces = [
+        {
+            'type': 'scatter',
+            'x': x,
+            'y': y,
+            'mode': 'lines+markers',
+            'line': {'color': color, 'width': 3},
+            'marker': {'size': 8, 'line': {'width': 2, 'color': 'white'}},
+            'hovertemplate': _hovertemplate(x_label, y_label),
+        },
+        {
+            'type': 'scatter',
+            'x': x,
+            'y': y,
+            'fill': 'tozeroy',
+            'fillcolor': fill_color,
+            'line': {'color': 'rgba(0,0,0,0)'},
+            'hoverinfo': 'skip',
+            'showlegend': False,
+        },
+    ]
+    annotations = [
+        {'x': xi, 'y': yi, 'text': label, 'showarrow': False, 'yshift': 10, 'font': {'color': "#2c3e50"}}
+        for xi, yi, label in zip(x, y, labels)
+    ]
+    return _figure(traces, _layout(
+        title,
+        margin=dict(b=100),
+        xaxis=_axis(x_label, tickangle=-45),
+        yaxis=_axis(y_label),
+        hovermode="x unified",
+        annotations=annotations,
+    ))
+
+@profiled(cache=cached('charts'))
+def create_pareto_chart(pareto, language='pt', category_label=None, title=None):
+    """Create a Pareto chart with Plotly (of causes unless category_label and title say otherwise)."""
     t = get_translation(language)
     
     if pareto.empty:
         return None
     
-    # Convert durations to hours
-    pareto_hours = pareto.apply(lambda x: x.total_seconds() / 3600)
-    
-    fig = px.bar(
-        x=pareto_hours.index,
-        y=pareto_hours.values,
-        labels={'x': t('stoppage_cause'), 'y': t('total_duration_hours')},
-        title=t('pareto_stoppages_title'),
-        color_discrete_sequence=['#3498db'],
-        text=pareto_hours.values.round(1)
-    )
+    category_label = category_label or t('stoppage_cause')
     
-    fig.update_traces(
-        texttemplate='%{text}h',
-        textposition='outside',
-        width=0.7,
-        marker_line_width=1,
-        marker_line_color='rgba(0,0,0,0.1)'
-    )
+    # Convert durations to hours
+    pareto_hours = pareto.dt.total_seconds().to_numpy() / 3600
     
-    fig.update_layout(
-        xaxis_tickangle=-45,
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=100),
-        plot_bgcolor='rgba(0,0,0,0)',
-        yaxis_title=t('total_duration_hours'),
-        xaxis_title=t('stoppage_cause'),
-        hoverlabel=dict(
-            bgcolor="white",
-            font_size=12,
-            font_family="Arial"
-        ),
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
+    trace = _bar(
+        pareto.index.tolist(), pareto_hours, '#3498db',
+        category_label, t('total_duration_hours'),
+        text=pareto_hours.round(1), texttemplate='%{text}h'
     )
     
-    return fig
+    return _figure([trace], _layout(
+        title or t('pareto_stoppages_title'),
+        margin=dict(b=100),
+        xaxis=_axis(category_label, tickangle=-45),
+        yaxis=_axis(t('total_duration_hours'))
+    ))
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_area_pie_chart(area_index, language='pt'):
     """Create a pie chart for responsible areas with Plotly."""
     t = get_translation(language)
@@ -63,43 +178,13 @@ def create_area_pie_chart(area_index, language='pt'):
     if area_index.empty:
         return None
     
-    fig = px.pie(
-        values=area_index.values,
-        names=area_index.index,
-        title=t('stoppages_by_area_title'),
-        color_discrete_sequence=px.colors.qualitative.Set3,
-        hole=0.4
-    )
-    
-    fig.update_traces(
-        textposition='inside',
-        textinfo='percent+label',
-        marker=dict(line=dict(color='#FFFFFF', width=2)),
-        pull=[0.05 if i == area_index.values.argmax() else 0 for i in range(len(area_index))],
-        textfont_size=12
-    )
+    # Pull the largest slice out of the pie
+    largest = area_index.values.argmax()
+    pull = [0.05 if i == largest else 0 for i in range(len(area_index))]
     
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=20, r=20, t=80, b=20),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.2,
-            xanchor="center",
-            x=0.5
-        ),
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        }
-    )
-    
-    return fig
+    return _pie(area_index.values, area_index.index.tolist(), t('stoppages_by_area_title'), pull=pull)
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_occurrences_chart(occurrences, language='pt'):
     """Create a line chart for monthly occurrences with Plotly."""
     t = get_translation(language)
@@ -107,65 +192,15 @@ def create_occurrences_chart(occurrences, language='pt'):
     if occurrences.empty or len(occurrences) <= 1:
         return None
     
-    fig = px.line(
-        x=occurrences.index,
-        y=occurrences.values,
-        markers=True,
-        labels={'x': t('month'), 'y': t('number_of_stoppages')},
-        title=t('stoppages_by_month_title'),
-        color_discrete_sequence=['#2ecc71']
-    )
-    
-    # Add area under the line
-    fig.add_trace(
-        go.Scatter(
-            x=occurrences.index,
-            y=occurrences.values,
-            fill='tozeroy',
-            fillcolor='rgba(46, 204, 113, 0.2)',
-            line=dict(color='rgba(46, 204, 113, 0)'),
-            showlegend=False
-        )
-    )
-    
-    # Update line and markers
-    fig.update_traces(
-        line=dict(width=3),
-        marker=dict(size=8, line=dict(width=2, color='white')),
-        selector=dict(mode='lines+markers')
-    )
-    
-    # Add values above points
-    for i, v in enumerate(occurrences):
-        fig.add_annotation(
-            x=occurrences.index[i],
-            y=v,
-            text=str(v),
-            showarrow=False,
-            yshift=10,
-            font=dict(color="#2c3e50")
-        )
-    
-    fig.update_layout(
-        xaxis_tickangle=-45,
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=100),
-        plot_bgcolor='rgba(0,0,0,0)',
-        yaxis_title=t('number_of_stoppages'),
-        xaxis_title=t('month'),
-        hovermode="x unified",
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
+    return _line_with_area(
+        occurrences.index.tolist(), occurrences.tolist(),
+        '#2ecc71', 'rgba(46, 204, 113, 0.2)',
+        t('month'), t('number_of_stoppages'),
+        [str(v) for v in occurrences],
+        t('stoppages_by_month_title')
     )
-    
-    return fig
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_monthly_duration_chart(monthly_duration, language='pt'):
     """Create a line chart for total stoppage duration by month."""
     t = get_translation(language)
@@ -174,67 +209,33 @@ def create_monthly_duration_chart(monthly_duration, language='pt'):
         return None
     
     # Convert durations to hours
-    duration_hours = monthly_duration.apply(lambda x: x.total_seconds() / 3600)
-    
-    fig = px.line(
-        x=duration_hours.index,
-        y=duration_hours.values,
-        markers=True,
-        labels={'x': t('month'), 'y': t('total_duration_hours')},
-        title=t('total_duration_by_month_title'),
-        color_discrete_sequence=['#e74c3c']
-    )
+    duration_hours = (monthly_duration.dt.total_seconds() / 3600).tolist()
     
-    # Add area under the line
-    fig.add_trace(
-        go.Scatter(
-            x=duration_hours.index,
-            y=duration_hours.values,
-            fill='tozeroy',
-            fillcolor='rgba(231, 76, 60, 0.2)',
-            line=dict(color='rgba(231, 76, 60, 0)'),
-            showlegend=False
-        )
+    return _line_with_area(
+        monthly_duration.index.tolist(), duration_hours,
+        '#e74c3c', 'rgba(231, 76, 60, 0.2)',
+        t('month'), t('total_duration_hours'),
+        [f"{v:.1f}h" for v in duration_hours],
+        t('total_duration_by_month_title')
     )
+
+def _horizontal_hours_chart(durations, color, category_label, title, t):
+    """Horizontal bar chart of durations (converted to hours), largest at the top."""
+    hours = (durations.dt.total_seconds() / 3600).sort_values(ascending=True)
     
-    # Update line and markers
-    fig.update_traces(
-        line=dict(width=3),
-        marker=dict(size=8, line=dict(width=2, color='white')),
-        selector=dict(mode='lines+markers')
+    trace = _bar(
+        hours.to_numpy(), hours.index.tolist(), color,
+        t('total_duration_hours'), category_label,
+        text=hours.to_numpy().round(1), texttemplate='%{text}h', orientation='h'
     )
     
-    # Add values above points
-    for i, v in enumerate(duration_hours):
-        fig.add_annotation(
-            x=duration_hours.index[i],
-            y=v,
-            text=f"{v:.1f}h",
-            showarrow=False,
-            yshift=10,
-            font=dict(color="#2c3e50")
-        )
-    
-    fig.update_layout(
-        xaxis_tickangle=-45,
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=100),
-        plot_bgcolor='rgba(0,0,0,0)',
-        yaxis_title=t('total_duration_hours'),
-        xaxis_title=t('month'),
-        hovermode="x unified",
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
-    )
-    
-    return fig
+    return _figure([trace], _layout(
+        title,
+        xaxis=_axis(t('total_duration_hours')),
+        yaxis=_axis(category_label)
+    ))
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_area_time_chart(area_time, language='pt'):
     """Create a horizontal bar chart for time by area with Plotly."""
     t = get_translation(language)
@@ -242,191 +243,70 @@ def create_area_time_chart(area_time, language='pt'):
     if area_time.empty:
         return None
     
-    # Convert durations to hours
-    area_time_hours = area_time.apply(lambda x: x.total_seconds() / 3600)
-    
-    # Sort data for better visualization
-    area_time_hours = area_time_hours.sort_values(ascending=True)
-    
-    fig = px.bar(
-        y=area_time_hours.index,
-        x=area_time_hours.values,
-        orientation='h',
-        labels={'y': t('responsible_area'), 'x': t('total_duration_hours')},
-        title=t('total_time_by_area_title'),
-        color_discrete_sequence=['#e74c3c'],
-        text=area_time_hours.values.round(1)
-    )
-    
-    fig.update_traces(
-        texttemplate='%{text}h',
-        textposition='outside',
-        width=0.7,
-        marker_line_width=1,
-        marker_line_color='rgba(0,0,0,0.1)'
-    )
-    
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=50),
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis_title=t('total_duration_hours'),
-        yaxis_title=t('responsible_area'),
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
-    )
-    
-    return fig
+    return _horizontal_hours_chart(area_time, '#e74c3c', t('responsible_area'), t('total_time_by_area_title'), t)
 
-@st.cache_data
-def create_critical_stoppages_chart(top_critical, language='pt'):
+def _limit_label(minutes):
+    """Readable duration limit: '45 min', '1h', '1h30'."""
+    hours, rest = divmod(int(minutes), 60)
+    if not hours:
+        return f"{rest} min"
+    return f"{hours}h{rest:02d}" if rest else f"{hours}h"
+
+@profiled(cache=cached('charts'))
+def create_critical_stoppages_chart(top_critical, limit_minutes=60, language='pt'):
     """Create a horizontal bar chart for critical stoppages with Plotly."""
     t = get_translation(language)
     
     if top_critical.empty:
         return None
     
-    # Convert durations to hours
-    top_critical_hours = top_critical.apply(lambda x: x.total_seconds() / 3600)
-    
-    # Sort data for better visualization
-    top_critical_hours = top_critical_hours.sort_values(ascending=True)
-    
-    fig = px.bar(
-        y=top_critical_hours.index,
-        x=top_critical_hours.values,
-        orientation='h',
-        labels={'y': t('stoppage_type'), 'x': t('total_duration_hours')},
-        title=t('critical_stoppages_title'),
-        color_discrete_sequence=['#9b59b6'],
-        text=top_critical_hours.values.round(1)
-    )
-    
-    fig.update_traces(
-        texttemplate='%{text}h',
-        textposition='outside',
-        width=0.7,
-        marker_line_width=1,
-        marker_line_color='rgba(0,0,0,0.1)'
-    )
-    
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=50),
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis_title=t('total_duration_hours'),
-        yaxis_title=t('stoppage_type'),
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
-    )
-    
-    return fig
+    title = t('critical_stoppages_title').format(limit=_limit_label(limit_minutes))
+    return _horizontal_hours_chart(top_critical, '#9b59b6', t('stoppage_type'), title, t)
 
-@st.cache_data
-def create_critical_areas_pie_chart(critical_stoppages, language='pt'):
-    """Create a pie chart for responsible areas for critical stoppages."""
+@profiled(cache=cached('charts'))
+def create_critical_areas_pie_chart(critical_areas, language='pt'):
+    """Create a pie chart of the number of critical stoppages per responsible area."""
     t = get_translation(language)
     
-    if 'Área Responsável' not in critical_stoppages.columns or critical_stoppages.empty:
+    if critical_areas.empty:
         return None
     
-    critical_areas = critical_stoppages['Área Responsável'].value_counts()
-    
-    fig = px.pie(
-        values=critical_areas.values,
-        names=critical_areas.index,
-        title=t('critical_stoppages_by_area_title'),
-        color_discrete_sequence=px.colors.qualitative.Set3,
-        hole=0.4
-    )
-    
-    fig.update_traces(
-        textposition='inside',
-        textinfo='percent+label',
-        marker=dict(line=dict(color='#FFFFFF', width=2)),
-        textfont_size=12
-    )
-    
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=20, r=20, t=80, b=20),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.2,
-            xanchor="center",
-            x=0.5
-        ),
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        }
-    )
-    
-    return fig
+    return _pie(critical_areas.values, critical_areas.index.tolist(), t('critical_stoppages_by_area_title'))
 
-@st.cache_data
-def create_duration_distribution_chart(df, language='pt'):
-    """Create a histogram of the distribution of stoppage durations."""
+@profiled(cache=cached('charts'))
+def create_duration_distribution_chart(histogram, language='pt'):
+    """Create a bar chart of the (server-side binned) stoppage duration distribution."""
     t = get_translation(language)
     
-    if df.empty:
+    if histogram.empty:
         return None
     
-    # Convert durations to minutes for better visualization
-    durations_minutes = df['Duração'].apply(lambda x: x.total_seconds() / 60)
-    
-    fig = px.histogram(
-        x=durations_minutes,
-        nbins=20,
-        labels={'x': t('duration_minutes'), 'y': t('frequency')},
-        title=t('duration_distribution_title'),
-        color_discrete_sequence=['#1abc9c']
-    )
-    
-    fig.update_traces(
-        marker_line_width=1,
-        marker_line_color='rgba(0,0,0,0.1)',
-        opacity=0.8
-    )
-    
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=50),
-        plot_bgcolor='rgba(0,0,0,0)',
-        xaxis_title=t('duration_minutes'),
-        yaxis_title=t('frequency'),
-        bargap=0.1,
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
-    )
-    
-    return fig
+    # Only the bin labels and counts are sent to the browser
+    labels = [f"{interval.left:.3g}–{interval.right:.3g}" for interval in histogram.index]
+    
+    trace = {
+        'type': 'bar',
+        'x': labels,
+        'y': histogram.values,
+        'marker': {'color': '#1abc9c', **BAR_STYLE['marker']},
+        'opacity': 0.8,
+        'hovertemplate': f"%{{x}} min<br>{t('frequency')}: %{{y}}<extra></extra>"
+    }
+    
+    return _figure([trace], _layout(
+        t('duration_distribution_title'),
+        margin=dict(b=100),
+        xaxis=_axis(t('duration_minutes'), tickangle=-45),
+        yaxis=_axis(t('frequency')),
+        bargap=0.1
+    ))
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_comparison_gauge_chart(value1, value2, title, max_value=100, language='pt'):
     """Create a gauge chart to compare two values."""
     t = get_translation(language)
     
     diff = value2 - value1
-    pct_diff = (diff / value1) * 100 if value1 > 0 else 0
     
     # Determine color based on metric type
     if title.lower() in ['availability', 'efficiency', 'mtbf', 'disponibilidade', 'eficiência']:
@@ -434,54 +314,47 @@ def create_comparison_gauge_chart(value1, value2, title, max_value=100, language
     else:
         color = "#2ecc71" if diff < 0 else "#e74c3c"
     
-    fig = go.Figure()
-    
-    # Add first period value as reference
-    fig.add_trace(go.Indicator(
-        mode="number",
-        value=value1,
-        title={"text": f"<span style='font-size:0.8em;color:gray'>{t('period')} 1</span>"},
-        domain={'row': 0, 'column': 0},
-        number={'suffix': '%' if max_value == 100 else 'h', 'font': {'size': 20, 'color': 'gray'}},
-    ))
-    
-    # Add gauge for current period
-    fig.add_trace(go.Indicator(
-        mode="gauge+number+delta",
-        value=value2,
-        title={"text": "Disponibilidade Comparação"},
-        delta={'reference': value1, 'relative': True, 'valueformat': '.1f%'},
-        gauge={
-            'axis': {'range': [None, max_value], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': color},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, max_value/3], 'color': 'rgba(255, 0, 0, 0.1)'},
-                {'range': [max_value/3, 2*max_value/3], 'color': 'rgba(255, 255, 0, 0.1)'},
-                {'range': [2*max_value/3, max_value], 'color': 'rgba(0, 255, 0, 0.1)'}
-            ],
+    suffix = '%' if max_value == 100 else 'h'
+    traces = [
+        # First period value as reference
+        {
+            'type': 'indicator',
+            'mode': "number",
+            'value': value1,
+            'title': {"text": f"<span style='font-size:0.8em;color:gray'>{t('period')} 1</span>"},
+            'domain': {'row': 0, 'column': 0},
+            'number': {'suffix': suffix, 'font': {'size': 20, 'color': 'gray'}},
         },
-        number={'suffix': '%' if max_value == 100 else 'h', 'font': {'size': 30}},
-        domain={'row': 0, 'column': 1}
-    ))
+        # Gauge for current period
+        {
+            'type': 'indicator',
+            'mode': "gauge+number+delta",
+            'value': value2,
+            'title': {"text": "Disponibilidade Comparação"},
+            'delta': {'reference': value1, 'relative': True, 'valueformat': '.1f%'},
+            'gauge': {
+                'axis': {'range': [None, max_value], 'tickwidth': 1, 'tickcolor': "darkblue"},
+                'bar': {'color': color},
+                'bgcolor': "white",
+                'borderwidth': 2,
+                'bordercolor': "gray",
+                'steps': [
+                    {'range': [0, max_value/3], 'color': 'rgba(255, 0, 0, 0.1)'},
+                    {'range': [max_value/3, 2*max_value/3], 'color': 'rgba(255, 255, 0, 0.1)'},
+                    {'range': [2*max_value/3, max_value], 'color': 'rgba(0, 255, 0, 0.1)'}
+                ],
+            },
+            'number': {'suffix': suffix, 'font': {'size': 30}},
+            'domain': {'row': 0, 'column': 1}
+        },
+    ]
     
-    fig.update_layout(
+    return _figure(traces, _layout(
         grid={'rows': 1, 'columns': 2, 'pattern': "independent"},
-        margin=dict(l=50, r=50, t=80, b=50),
-        height=250,
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        }
-    )
-    
-    return fig
+        height=250
+    ))
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_comparative_bar_chart(metric1, metric2, title, language='pt'):
     """Create a comparative bar chart for two periods."""
     t = get_translation(language)
@@ -494,54 +367,27 @@ def create_comparative_bar_chart(metric1, metric2, title, language='pt'):
     
     # Determine color based on metric type
     if title.lower() in ['availability', 'efficiency', 'mtbf', 'disponibilidade', 'eficiência']:
-        colors = ["#3498db", "#2ecc71" if diff > 0 else "#e74c3c"]
+        bar_colors = ["#3498db", "#2ecc71" if diff > 0 else "#e74c3c"]
     else:
-        colors = ["#3498db", "#2ecc71" if diff < 0 else "#e74c3c"]
-    
-    fig = px.bar(
-        x=labels,
-        y=values,
-        text=[f"{v:.2f}" for v in values],
-        title=f"{title} {t('comparison')}",
-        color_discrete_sequence=colors
-    )
+        bar_colors = ["#3498db", "#2ecc71" if diff < 0 else "#e74c3c"]
     
-    fig.update_traces(
-        textposition='outside',
-        textfont_size=14,
-        width=0.7,
-        marker_line_width=1,
-        marker_line_color='rgba(0,0,0,0.1)'
-    )
+    # A single trace, drawn like px.bar with color_discrete_sequence: its first colour
+    trace = _bar(labels, values, bar_colors[0], 'x', 'y', text=[f"{v:.2f}" for v in values])
+    trace['textfont'] = {'size': 14}
     
-    # Add annotation showing the percent change
+    # Annotation showing the percent change
     arrow = "⬆️" if diff > 0 else "⬇️"
-    annotation_text = f"{arrow} {abs(pct_diff):.1f}%"
-    
-    fig.add_annotation(
-        x=1, y=metric2,
-        text=annotation_text,
-        showarrow=False,
-        font=dict(size=16),
-        yshift=20
-    )
-    
-    fig.update_layout(
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=50),
-        plot_bgcolor='rgba(0,0,0,0)',
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
-    )
-    
-    return fig
+    annotation = {
+        'x': 1, 'y': metric2,
+        'text': f"{arrow} {abs(pct_diff):.1f}%",
+        'showarrow': False,
+        'font': dict(size=16),
+        'yshift': 20
+    }
+    
+    return _figure([trace], _layout(f"{title} {t('comparison')}", annotations=[annotation]))
 
-@st.cache_data
+@profiled(cache=cached('charts'))
 def create_shifts_distribution_chart(shifts_data, language='pt'):
     """Create a bar chart for shift distribution."""
     t = get_translation(language)
@@ -549,37 +395,58 @@ def create_shifts_distribution_chart(shifts_data, language='pt'):
     if shifts_data.empty:
         return None
     
-    fig = px.bar(
-        x=shifts_data.index,
-        y=shifts_data.values,
-        labels={'x': 'Turno', 'y': 'Número de Paradas'},
-        title='Distribuição de Paradas por Turno',
-        color_discrete_sequence=['#2ecc71'],
-        text=shifts_data.values
+    trace = _bar(
+        shifts_data.index.tolist(), shifts_data.values, '#2ecc71',
+        'Turno', 'Número de Paradas',
+        text=shifts_data.values, texttemplate='%{text:.0f}'
     )
     
-    fig.update_traces(
-        texttemplate='%{text:.0f}',
-        textposition='outside',
-        width=0.7,
-        marker_line_width=1,
-        marker_line_color='rgba(0,0,0,0.1)'
-    )
+    return _figure([trace], _layout(
+        'Distribuição de Paradas por Turno',
+        xaxis=_axis('Turno', tickangle=0),
+        yaxis=_axis('Número de Paradas')
+    ))
+
+@profiled(cache=cached('charts'))
+def create_trend_chart(time_series, column, freq='D', max_points=TREND_MAX_POINTS, method='lttb', language='pt'):
+    """
+    Create a daily or hourly trend chart, downsampled on the server.
+    
+    Args:
+        time_series: Output of calculate_stoppage_time_series
+        column: 'Paradas' or 'Duração (h)'
+        freq: Granularity of the series ('D' or 'h')
+        max_points: Points sent to the browser (None sends the full resolution)
+        method: Downsampling method ('lttb' or 'minmax', see core.downsampling)
+    """
+    t = get_translation(language)
     
-    fig.update_layout(
-        xaxis_tickangle=0,
-        autosize=True,
-        margin=dict(l=50, r=50, t=80, b=50),
-        plot_bgcolor='rgba(0,0,0,0)',
-        yaxis_title='Número de Paradas',
-        xaxis_title='Turno',
-        title={
-            'y':0.95,
-            'x':0.5,
-            'xanchor': 'center',
-            'yanchor': 'top'
-        },
-        showlegend=False
-    )
+    if time_series.empty or len(time_series) <= 1:
+        return None
     
-    return fig
+    x, y = time_series.index.to_numpy(), time_series[column].to_numpy()
+    positions = downsample_indices(x, y, max_points, method)
+    title = t(TREND_TITLES[(column, freq)])
+    if len(positions) < len(y):
+        fmt = get_formatter(language)
+        shown = t('downsampled_points').format(shown=fmt.number(len(positions), 0), total=fmt.number(len(y), 0))
+        title = f"{title}<br><sup>{shown}</sup>"
+    
+    y_label = t('number_of_stoppages') if column == 'Paradas' else t('total_duration_hours')
+    color = '#2ecc71' if column == 'Paradas' else '#e74c3c'
+    trace = {
+        # Large series are drawn with WebGL, which keeps pan and zoom responsive
+        'type': 'scattergl' if len(positions) > WEBGL_THRESHOLD else 'scatter',
+        'x': x[positions],
+        'y': y[positions],
+        'mode': 'lines',
+        'line': {'color': color, 'width': 1.5},
+        'hovertemplate': _hovertemplate(t('date'), y_label),
+    }
+    
+    return _figure([trace], _layout(
+        title,
+        xaxis=_axis(t('date')),
+        yaxis=_axis(y_label, rangemode='tozero'),
+        hovermode="x unified"
+    ))